@@ -0,0 +1,53 @@
+"""Add monthly category totals
+
+Revision ID: 003_monthly_category_totals
+Revises: 002_fix_transaction_columns
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+
+# revision identifiers, used by Alembic.
+revision = '003_monthly_category_totals'
+down_revision = '002_fix_transaction_columns'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Create monthly totals table
+    op.create_table('monthly_category_totals',
+        sa.Column('id', UUID(as_uuid=True), primary_key=True),
+        sa.Column('user_id', UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('year', sa.Integer(), nullable=False),
+        sa.Column('month', sa.Integer(), nullable=False),
+        sa.Column('type', sa.String(), nullable=False),
+        sa.Column('category_id', UUID(as_uuid=True), sa.ForeignKey('categories.id', ondelete='SET NULL'), nullable=True),
+        sa.Column('total', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('count', sa.Integer(), nullable=False, server_default='0')
+    )
+
+    op.create_index(
+        'ix_monthly_category_totals_bucket',
+        'monthly_category_totals',
+        ['user_id', 'year', 'month', 'type', 'category_id'],
+        unique=True
+    )
+
+    # Backfill from existing transactions
+    op.execute("""
+        INSERT INTO monthly_category_totals (id, user_id, year, month, type, category_id, total, count)
+        SELECT gen_random_uuid(), user_id,
+               CAST(substr(date, 1, 4) AS INTEGER), CAST(substr(date, 6, 2) AS INTEGER),
+               CAST(type AS VARCHAR), category_id, SUM(amount), COUNT(*)
+        FROM transactions
+        GROUP BY user_id, substr(date, 1, 4), substr(date, 6, 2), type, category_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_monthly_category_totals_bucket', table_name='monthly_category_totals')
+    op.drop_table('monthly_category_totals')
@@ -0,0 +1,52 @@
+"""Native date column and per-user date index for transactions
+
+Revision ID: 004_transaction_date_type
+Revises: 003_monthly_category_totals
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '004_transaction_date_type'
+down_revision = '003_monthly_category_totals'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Convert YYYY-MM-DD strings to a real DATE
+    op.alter_column(
+        'transactions', 'date',
+        type_=sa.Date(),
+        existing_type=sa.String(),
+        existing_nullable=False,
+        postgresql_using='date::date'
+    )
+
+    # Replace the single-column indexes with one composite index that
+    # matches the listing order, so month filters are a tight range scan
+    op.drop_index(op.f('ix_transactions_date'), table_name='transactions')
+    op.drop_index(op.f('ix_transactions_user_id'), table_name='transactions')
+    op.create_index(
+        'ix_transactions_user_id_date',
+        'transactions',
+        ['user_id', sa.text('date DESC'), sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_transactions_user_id_date', table_name='transactions')
+    op.create_index(op.f('ix_transactions_user_id'), 'transactions', ['user_id'], unique=False)
+    op.create_index(op.f('ix_transactions_date'), 'transactions', ['date'], unique=False)
+
+    op.alter_column(
+        'transactions', 'date',
+        type_=sa.String(),
+        existing_type=sa.Date(),
+        existing_nullable=False,
+        postgresql_using="to_char(date, 'YYYY-MM-DD')"
+    )
@@ -0,0 +1,40 @@
+"""Tombstones and updated_at indexes for delta sync
+
+Revision ID: 005_sync_tombstones
+Revises: 004_transaction_date_type
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+
+# revision identifiers, used by Alembic.
+revision = '005_sync_tombstones'
+down_revision = '004_transaction_date_type'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Create tombstones table
+    op.create_table('tombstones',
+        sa.Column('id', UUID(as_uuid=True), primary_key=True),
+        sa.Column('user_id', UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('entity', sa.String(), nullable=False),
+        sa.Column('entity_id', UUID(as_uuid=True), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(), nullable=False, server_default=sa.func.now())
+    )
+    op.create_index('ix_tombstones_user_id_deleted_at', 'tombstones', ['user_id', 'deleted_at'])
+
+    # Changes since a sync token are a range scan per user
+    op.create_index('ix_categories_user_id_updated_at', 'categories', ['user_id', 'updated_at'])
+    op.create_index('ix_transactions_user_id_updated_at', 'transactions', ['user_id', 'updated_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_transactions_user_id_updated_at', table_name='transactions')
+    op.drop_index('ix_categories_user_id_updated_at', table_name='categories')
+    op.drop_index('ix_tombstones_user_id_deleted_at', table_name='tombstones')
+    op.drop_table('tombstones')
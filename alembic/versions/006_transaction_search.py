@@ -0,0 +1,64 @@
+"""Full-text search over transaction names and notes
+
+Revision ID: 006_transaction_search
+Revises: 005_sync_tombstones
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '006_transaction_search'
+down_revision = '005_sync_tombstones'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        # Generated column: maintained by PostgreSQL, backfilled by the ALTER
+        op.execute(
+            "ALTER TABLE transactions ADD COLUMN search_vector tsvector GENERATED ALWAYS AS "
+            "(setweight(to_tsvector('simple', name), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(note, '')), 'B')) STORED"
+        )
+        op.execute("CREATE INDEX ix_transactions_search_vector ON transactions USING gin (search_vector)")
+        # Fuzzy matching (name % query) for typos
+        op.execute("CREATE INDEX ix_transactions_name_trgm ON transactions USING gin (name gin_trgm_ops)")
+    else:
+        op.execute(
+            "CREATE VIRTUAL TABLE transactions_fts USING fts5("
+            "name, note, content='transactions', content_rowid='rowid', "
+            "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+        )
+        op.execute(
+            "CREATE TRIGGER transactions_fts_insert AFTER INSERT ON transactions BEGIN "
+            "INSERT INTO transactions_fts(rowid, name, note) VALUES (new.rowid, new.name, new.note); END"
+        )
+        op.execute(
+            "CREATE TRIGGER transactions_fts_delete AFTER DELETE ON transactions BEGIN "
+            "INSERT INTO transactions_fts(transactions_fts, rowid, name, note) "
+            "VALUES ('delete', old.rowid, old.name, old.note); END"
+        )
+        op.execute(
+            "CREATE TRIGGER transactions_fts_update AFTER UPDATE OF name, note ON transactions BEGIN "
+            "INSERT INTO transactions_fts(transactions_fts, rowid, name, note) "
+            "VALUES ('delete', old.rowid, old.name, old.note); "
+            "INSERT INTO transactions_fts(rowid, name, note) VALUES (new.rowid, new.name, new.note); END"
+        )
+        # Index the existing rows
+        op.execute("INSERT INTO transactions_fts(transactions_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_transactions_name_trgm")
+        op.execute("DROP INDEX IF EXISTS ix_transactions_search_vector")
+        op.execute("ALTER TABLE transactions DROP COLUMN IF EXISTS search_vector")
+    else:
+        op.execute("DROP TRIGGER IF EXISTS transactions_fts_update")
+        op.execute("DROP TRIGGER IF EXISTS transactions_fts_delete")
+        op.execute("DROP TRIGGER IF EXISTS transactions_fts_insert")
+        op.execute("DROP TABLE IF EXISTS transactions_fts")
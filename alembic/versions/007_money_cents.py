@@ -0,0 +1,73 @@
+"""Store money as integer cents
+
+Revision ID: 007_money_cents
+Revises: 006_transaction_search
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '007_money_cents'
+down_revision = '006_transaction_search'
+branch_labels = None
+depends_on = None
+
+# (table, float column, cents column)
+MONEY_COLUMNS = [
+    ('transactions', 'amount', 'amount_cents'),
+    ('monthly_category_totals', 'total', 'total_cents'),
+]
+
+
+# Dialect-specific SQL for rebuilding the rollup: new row id, year, month
+ROLLUP_EXPRESSIONS = {
+    'postgresql': (
+        "gen_random_uuid()",
+        "CAST(EXTRACT(YEAR FROM date) AS INTEGER)",
+        "CAST(EXTRACT(MONTH FROM date) AS INTEGER)",
+    ),
+    'sqlite': (
+        "lower(hex(randomblob(16)))",
+        "CAST(strftime('%Y', date) AS INTEGER)",
+        "CAST(strftime('%m', date) AS INTEGER)",
+    ),
+}
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    for table, float_column, cents_column in MONEY_COLUMNS:
+        # The default only fills existing rows until the UPDATE below.
+        # ROUND on a NUMERIC rounds half up like the app; PostgreSQL rounds
+        # a double precision half to even
+        op.add_column(table, sa.Column(cents_column, sa.BigInteger(), nullable=False, server_default='0'))
+        op.execute(
+            f"UPDATE {table} SET {cents_column} = CAST(ROUND(CAST({float_column} AS NUMERIC) * 100) AS BIGINT)"
+        )
+        op.drop_column(table, float_column)
+        if dialect == 'postgresql':
+            op.alter_column(table, cents_column, server_default=None)
+
+    # Each amount was rounded on its own, so converted totals can be a cent
+    # off; recompute the rollup from the converted transactions instead
+    new_id, year, month = ROLLUP_EXPRESSIONS[dialect]
+    op.execute("DELETE FROM monthly_category_totals")
+    op.execute(f"""
+        INSERT INTO monthly_category_totals (id, user_id, year, month, type, category_id, total_cents, count)
+        SELECT {new_id}, user_id, {year}, {month}, type, category_id, SUM(amount_cents), COUNT(*)
+        FROM transactions
+        GROUP BY user_id, {year}, {month}, type, category_id
+    """)
+
+
+def downgrade() -> None:
+    postgresql = op.get_bind().dialect.name == 'postgresql'
+    for table, float_column, cents_column in MONEY_COLUMNS:
+        op.add_column(table, sa.Column(float_column, sa.Float(), nullable=False, server_default='0'))
+        op.execute(f"UPDATE {table} SET {float_column} = {cents_column} / 100.0")
+        op.drop_column(table, cents_column)
+        if postgresql:
+            op.alter_column(table, float_column, server_default=None)
@@ -3,7 +3,7 @@ Main API router that combines all endpoint routers
 """
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import auth, categories, transactions, summary, user
+from app.api.v1.endpoints import auth, batch, categories, transactions, summary, sync, user
 
 api_router = APIRouter()
 
@@ -12,4 +12,6 @@ api_router.include_router(auth.router, prefix="/auth", tags=["authentication"])
 api_router.include_router(user.router, prefix="/user", tags=["user"])
 api_router.include_router(categories.router, tags=["categories"])
 api_router.include_router(transactions.router, tags=["transactions"])
-api_router.include_router(summary.router, tags=["summary"])
\ No newline at end of file
+api_router.include_router(summary.router, tags=["summary"])
+api_router.include_router(sync.router, tags=["sync"])
+api_router.include_router(batch.router, tags=["batch"])
\ No newline at end of file
@@ -5,10 +5,10 @@ from datetime import timedelta
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.deps import get_db
-from app.core.security import create_access_token
+from app.core.security import PasswordHashingBusy, create_access_token
 from app.models.models import User
 from app.schemas.schemas import UserCreate, AuthResponse, UserResponse, LoginRequest
 from app.services.services import AuthService
@@ -19,13 +19,13 @@ router = APIRouter()
 @router.post("/register", response_model=AuthResponse)
 async def register(
     user_data: UserCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
     Register a new user
     """
     try:
-        user = AuthService.register_user(db, user_data)
+        user = await AuthService.register_user(db, user_data)
         access_token = create_access_token(
             data={"sub": str(user.id)},
             expires_delta=timedelta(minutes=30)
@@ -41,6 +41,12 @@ async def register(
                 photo_url=user.photo_url
             )
         )
+    except PasswordHashingBusy as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -51,12 +57,19 @@ async def register(
 @router.post("/login", response_model=AuthResponse)
 async def login(
     request: LoginRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
     Login user
     """
-    user = AuthService.authenticate_user(db, request.email, request.password)
+    try:
+        user = await AuthService.authenticate_user(db, request.email, request.password)
+    except PasswordHashingBusy as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
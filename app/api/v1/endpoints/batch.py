@@ -0,0 +1,42 @@
+"""
+Batch mutation endpoints
+"""
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.deps import get_db, get_current_user
+from app.models.models import User
+from app.schemas.schemas import BatchRequest, BatchResponse
+from app.services.services import BatchService
+
+router = APIRouter()
+
+
+@router.post("/batch", response_model=BatchResponse)
+async def apply_batch(
+    batch: BatchRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+) -> Any:
+    """
+    Apply many category and transaction operations in one request.
+
+    Each operation is `{"op": "create"|"update"|"delete", "entity":
+    "transaction"|"category", "id": ..., "data": {...}}`, with `data` shaped
+    like the matching single-item endpoint. Creates may pass a client
+    generated UUID as `id`, so later operations in the batch can refer to
+    it. Operations run in order in one DB transaction; failures are
+    reported per operation, and with `atomic: true` any failure rolls back
+    the whole batch.
+    """
+    if len(batch.operations) > settings.BATCH_MAX_OPERATIONS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.BATCH_MAX_OPERATIONS} operations per batch"
+        )
+
+    results, applied = await BatchService.apply(db, current_user.id, batch.operations, batch.atomic)
+    return BatchResponse(results=results, applied=applied)
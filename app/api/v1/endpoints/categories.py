@@ -1,28 +1,37 @@
 """
 Category endpoints
 """
+import uuid
 from typing import Any, List
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.deps import get_db, get_current_user
 from app.models.models import User
 from app.schemas.schemas import CategoryCreate, Category, CategoriesListResponse
 from app.services.services import CategoryService
+from app.utils.http_cache import conditional_get, version_etag
 
 router = APIRouter()
 
 
 @router.get("/categories", response_model=CategoriesListResponse)
 async def get_categories(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
     Get all categories for current user
     """
-    categories = CategoryService.get_user_categories(db, current_user.id)
+    version = await CategoryService.get_categories_version(db, current_user.id)
+    not_modified = conditional_get(request, response, version_etag("categories", *version))
+    if not_modified:
+        return not_modified
+
+    categories = await CategoryService.get_user_categories(db, current_user.id)
     return CategoriesListResponse(categories=categories)
 
 
@@ -30,25 +39,31 @@ async def get_categories(
 async def create_category(
     category_data: CategoryCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
     Create a new category
     """
-    category = CategoryService.create_category(db, current_user.id, category_data)
+    category = await CategoryService.create_category(db, current_user.id, category_data)
     return category
 
 
 @router.delete("/categories/{category_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_category(
-    category_id: str,
+    category_id: uuid.UUID,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> None:
     """
     Delete a category
     """
-    success = CategoryService.delete_category(db, current_user.id, category_id)
+    try:
+        success = await CategoryService.delete_category(db, current_user.id, category_id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
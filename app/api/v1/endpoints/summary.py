@@ -1,45 +1,84 @@
 """
 Summary endpoints
 """
+from datetime import date
 from typing import Any, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.core.deps import get_db, get_current_user
 from app.models.models import User
 from app.schemas.schemas import BalanceSummaryResponse, MonthlySummaryListResponse
 from app.services.services import SummaryService
+from app.utils.http_cache import cached_json_response
 
 router = APIRouter()
 
 
 @router.get("/summary", response_model=BalanceSummaryResponse)
 async def get_summary(
+    request: Request,
     month: int = Query(..., ge=1, le=12),
     year: int = Query(..., ge=2000, le=2100),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
     Get monthly balance summary
     """
-    summary = SummaryService.get_monthly_summary(db, current_user.id, month, year)
-    return summary
+    return await cached_json_response(
+        request, str(current_user.id), "summary", {"month": month, "year": year},
+        lambda: SummaryService.get_monthly_summary(db, current_user.id, month, year)
+    )
 
 
 @router.get("/summary/history", response_model=MonthlySummaryListResponse)
 async def get_summary_history(
+    request: Request,
     start_month: Optional[int] = Query(None, ge=1, le=12),
     start_year: Optional[int] = Query(None, ge=2000, le=2100),
     end_month: Optional[int] = Query(None, ge=1, le=12),
     end_year: Optional[int] = Query(None, ge=2000, le=2100),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
-    Get summary history for multiple months
+    Get summary history for multiple months.
+
+    Defaults to the last SUMMARY_HISTORY_MONTHS months up to the current
+    month. Months without transactions are included with zero totals.
     """
-    # For now, return empty list - implement pagination later
-    # This would require more complex logic to generate date ranges
-    return MonthlySummaryListResponse(summaries=[])
\ No newline at end of file
+    if (start_month is None) != (start_year is None) or (end_month is None) != (end_year is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Month and year must be given together"
+        )
+
+    if end_month is None:
+        today = date.today()
+        end_month, end_year = today.month, today.year
+    if start_month is None:
+        months_back = end_year * 12 + end_month - settings.SUMMARY_HISTORY_MONTHS
+        start_year, start_month = divmod(months_back, 12)
+        start_month += 1
+
+    async def build() -> MonthlySummaryListResponse:
+        summaries = await SummaryService.get_summary_history(
+            db, current_user.id, start_month, start_year, end_month, end_year
+        )
+        return MonthlySummaryListResponse(summaries=summaries)
+
+    try:
+        return await cached_json_response(
+            request, str(current_user.id), "summary/history",
+            {"start_month": start_month, "start_year": start_year,
+             "end_month": end_month, "end_year": end_year},
+            build
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
@@ -0,0 +1,40 @@
+"""
+Delta sync endpoints
+"""
+from typing import Any, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.deps import get_db, get_current_user
+from app.models.models import User
+from app.schemas.schemas import SyncResponse
+from app.services.services import SyncService
+from app.utils.fast_json import render_sync
+
+router = APIRouter()
+
+
+@router.get("/sync", response_model=SyncResponse)
+async def sync(
+    since: Optional[str] = Query(None, description="nextToken of the previous sync"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+) -> Any:
+    """
+    Get categories and transactions changed since the previous sync.
+
+    Without `since` (or with a token older than the tombstone retention)
+    everything is returned with `fullSync: true`. Store `nextToken` and pass
+    it as `since` next time.
+    """
+    try:
+        since_time = SyncService.decode_token(since) if since else None
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    changes = await SyncService.get_changes(db, current_user.id, since_time)
+    return Response(content=render_sync(changes), media_type="application/json")
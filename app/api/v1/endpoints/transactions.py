@@ -1,69 +1,231 @@
 """
 Transaction endpoints
 """
-from typing import Any, Optional
+import csv
+import datetime
+import io
+import json
+import uuid
+from decimal import Decimal
+from typing import Any, AsyncIterator, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.formparsers import MultiPartException, MultiPartParser
 
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
 from app.core.deps import get_db, get_current_user
 from app.models.models import User
 from app.schemas.schemas import (
-    TransactionCreate, TransactionUpdate, Transaction,
-    TransactionsListResponse, GroupedTransactionsResponse
+    TransactionCreate, TransactionUpdate, Transaction, TransactionFilter,
+    TransactionsListResponse, GroupedTransactionsResponse, BulkImportResponse
 )
 from app.services.services import TransactionService
+from app.utils.export import EXPORT_ENCODERS, EXPORT_MEDIA_TYPES, PARQUET_AVAILABLE
+from app.utils.fast_json import render_transactions_list
+from app.utils.http_cache import (
+    cached_json_response, etag_matches, json_response, not_modified, version_etag
+)
 
 router = APIRouter()
 
 
-@router.get("/transactions", response_model=TransactionsListResponse)
-async def get_transactions(
+def transaction_filters(
+    type: Optional[str] = Query(None, pattern="^(income|expense)$"),
+    category_id: Optional[List[uuid.UUID]] = Query(None, description="Repeat to match any of several categories"),
+    min_amount: Optional[Decimal] = Query(None, ge=0),
+    max_amount: Optional[Decimal] = Query(None, ge=0),
     month: Optional[int] = Query(None, ge=1, le=12),
     year: Optional[int] = Query(None, ge=2000, le=2100),
-    date: Optional[str] = Query(None, regex=r"^\d{4}-\d{2}-\d{2}$"),
-    start_date: Optional[str] = Query(None, regex=r"^\d{4}-\d{2}-\d{2}$"),
-    end_date: Optional[str] = Query(None, regex=r"^\d{4}-\d{2}-\d{2}$"),
+    date: Optional[datetime.date] = Query(None),
+    start_date: Optional[datetime.date] = Query(None),
+    end_date: Optional[datetime.date] = Query(None),
+    text: Optional[str] = Query(None, min_length=1, max_length=100, description="Substring of the name or note"),
+    sort: str = Query("date_desc", pattern="^(date|amount)_(asc|desc)$")
+) -> TransactionFilter:
+    """
+    Filter query parameters shared by the transaction read endpoints.
+    All given filters apply together; they are evaluated in SQL.
+    """
+    try:
+        return TransactionFilter(
+            type=type, category_ids=category_id, min_amount=min_amount, max_amount=max_amount,
+            month=month, year=year, date=date, start_date=start_date, end_date=end_date,
+            text=text, sort=sort
+        )
+    except ValidationError as e:
+        raise RequestValidationError([
+            {**error, "loc": ("query", *error["loc"])}
+            for error in e.errors(include_url=False, include_context=False)
+        ])
+
+
+@router.get("/transactions", response_model=TransactionsListResponse)
+async def get_transactions(
+    request: Request,
+    filters: TransactionFilter = Depends(transaction_filters),
+    limit: Optional[int] = Query(None, ge=1, le=settings.TRANSACTIONS_PAGE_SIZE_MAX),
+    cursor: Optional[str] = Query(None),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
-    Get transactions with optional filters
+    Get transactions with optional filters.
+
+    Pass `limit` (and the `nextCursor` of the previous page as `cursor`) to
+    page through the results instead of fetching them all at once.
+    """
+    version = await TransactionService.get_transactions_version(db, current_user.id, filters)
+    etag = version_etag("transactions", request.url.query, *version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    # Rows are encoded straight to JSON; see app/utils/fast_json.py
+    if limit is None and cursor is None:
+        rows = await TransactionService.get_user_transactions(db, current_user.id, filters, plain=True)
+        return json_response(request, render_transactions_list(rows), etag)
+
+    try:
+        rows, next_cursor = await TransactionService.get_transactions_page(
+            db, current_user.id, limit or settings.TRANSACTIONS_PAGE_SIZE, cursor, filters, plain=True
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    return json_response(request, render_transactions_list(rows, next_cursor), etag)
+
+
+@router.get("/transactions/stream")
+async def stream_transactions(
+    filters: TransactionFilter = Depends(transaction_filters),
+    current_user: User = Depends(get_current_user)
+) -> StreamingResponse:
+    """
+    Stream transactions as newline-delimited JSON, one transaction per line
     """
-    transactions = TransactionService.get_user_transactions(
-        db, current_user.id, month, year, date, start_date, end_date
+    user_id = current_user.id
+
+    async def lines():
+        # The stream outlives the request dependencies, so it owns its session
+        async with AsyncSessionLocal() as db:
+            async for transaction in TransactionService.stream_user_transactions(db, user_id, filters):
+                yield Transaction.model_validate(transaction).model_dump_json(by_alias=True) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@router.get("/transactions/export")
+async def export_transactions(
+    format: str = Query("csv", pattern="^(csv|ndjson|parquet)$"),
+    filters: TransactionFilter = Depends(transaction_filters),
+    current_user: User = Depends(get_current_user)
+) -> StreamingResponse:
+    """
+    Export transactions as a CSV, NDJSON or Parquet download
+    """
+    if format == "parquet" and not PARQUET_AVAILABLE:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Parquet export is not available on this server"
+        )
+
+    user_id = current_user.id
+    encode = EXPORT_ENCODERS[format]
+
+    async def content():
+        # The stream outlives the request dependencies, so it owns its session
+        async with AsyncSessionLocal() as db:
+            rows = TransactionService.stream_export_rows(db, user_id, filters)
+            async for chunk in encode(rows):
+                yield chunk
+
+    return StreamingResponse(
+        content(),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="transactions.{format}"'}
     )
-    return TransactionsListResponse(transactions=transactions)
+
+
+@router.get("/transactions/search", response_model=TransactionsListResponse)
+async def search_transactions(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=200),
+    filters: TransactionFilter = Depends(transaction_filters),
+    limit: int = Query(settings.SEARCH_PAGE_SIZE, ge=1, le=settings.TRANSACTIONS_PAGE_SIZE_MAX),
+    cursor: Optional[str] = Query(None),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+) -> Any:
+    """
+    Search transactions by name and note, best matches first, within the
+    usual filters.
+
+    Words match as prefixes ("cof" finds "Coffee"); on PostgreSQL close
+    misspellings of the name match too. Pass `nextCursor` as `cursor` for
+    the next page.
+    """
+    try:
+        rows, next_cursor = await TransactionService.search_transactions(
+            db, current_user.id, q, limit, cursor, filters
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    return json_response(request, render_transactions_list(rows, next_cursor))
 
 
 @router.get("/transactions/grouped", response_model=GroupedTransactionsResponse)
 async def get_grouped_transactions(
-    month: Optional[int] = Query(None, ge=1, le=12),
-    year: Optional[int] = Query(None, ge=2000, le=2100),
-    start_date: Optional[str] = Query(None, regex=r"^\d{4}-\d{2}-\d{2}$"),
-    end_date: Optional[str] = Query(None, regex=r"^\d{4}-\d{2}-\d{2}$"),
+    request: Request,
+    filters: TransactionFilter = Depends(transaction_filters),
+    days: Optional[int] = Query(None, ge=1, le=settings.GROUPED_PAGE_DAYS_MAX),
+    cursor: Optional[str] = Query(None),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
-    Get transactions grouped by date
+    Get transactions grouped by date, newest first, with per-date totals.
+
+    Pass `days` to get only that many dates with activity, and the
+    `nextCursor` of the previous page as `cursor` for the dates before it.
     """
-    grouped_transactions = TransactionService.get_grouped_transactions(
-        db, current_user.id, month, year, start_date, end_date
-    )
-    return GroupedTransactionsResponse(groups=grouped_transactions)
+    async def build() -> GroupedTransactionsResponse:
+        groups, next_cursor = await TransactionService.get_grouped_transactions(
+            db, current_user.id, filters, days, cursor
+        )
+        return GroupedTransactionsResponse(groups=groups, next_cursor=next_cursor)
+
+    try:
+        return await cached_json_response(
+            request, str(current_user.id), "transactions/grouped",
+            {**filters.model_dump(mode="json", exclude_none=True), "days": days, "cursor": cursor},
+            build
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
 
 
 @router.get("/transactions/{transaction_id}", response_model=Transaction)
 async def get_transaction(
-    transaction_id: str,
+    transaction_id: uuid.UUID,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
     Get a single transaction by ID
     """
-    transaction = TransactionService.get_transaction_by_id(db, current_user.id, transaction_id)
+    transaction = await TransactionService.get_transaction_by_id(db, current_user.id, transaction_id)
     if not transaction:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -76,13 +238,13 @@ async def get_transaction(
 async def create_transaction(
     transaction_data: TransactionCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
     Create a new transaction
     """
     try:
-        transaction = TransactionService.create_transaction(db, current_user.id, transaction_data)
+        transaction = await TransactionService.create_transaction(db, current_user.id, transaction_data)
         return transaction
     except ValueError as e:
         raise HTTPException(
@@ -91,18 +253,123 @@ async def create_transaction(
         )
 
 
+@router.post("/transactions/bulk", response_model=BulkImportResponse)
+async def bulk_create_transactions(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+) -> Any:
+    """
+    Import many transactions at once.
+
+    Accepts a JSON array of transactions, a `text/csv` body, or a multipart
+    upload with the CSV in a `file` field. CSV columns match the JSON fields
+    (type, name, categoryId, amount, date, note). Invalid rows are skipped
+    and reported by their 0-based index. Bodies over BULK_IMPORT_MAX_BYTES
+    are rejected with 413 and malformed JSON with 400.
+    """
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith("application/json"):
+        try:
+            rows = json.loads(await _read_import_body(request))
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid JSON"
+            )
+        if not isinstance(rows, list):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Expected a JSON array of transactions"
+            )
+    elif content_type.startswith("multipart/form-data"):
+        body = await _read_import_body(request)
+        try:
+            form = await MultiPartParser(request.headers, _single_chunk(body), max_files=1).parse()
+        except MultiPartException as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        upload = form.get("file")
+        if upload is None or isinstance(upload, str):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Missing CSV file"
+            )
+        rows = _read_csv(await upload.read())
+    elif content_type.startswith("text/csv"):
+        rows = _read_csv(await _read_import_body(request))
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Send a JSON array or a CSV file"
+        )
+
+    if len(rows) > settings.BULK_IMPORT_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.BULK_IMPORT_MAX_ROWS} transactions per import"
+        )
+
+    created, errors = await TransactionService.bulk_create_transactions(db, current_user.id, rows)
+    return BulkImportResponse(created=created, errors=errors)
+
+
+async def _read_import_body(request: Request) -> bytes:
+    """
+    Read an import body, failing with 413 as soon as it exceeds
+    BULK_IMPORT_MAX_BYTES instead of buffering whatever the client sends
+    """
+    too_large = HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Import body must be at most {settings.BULK_IMPORT_MAX_BYTES // 1024} KiB"
+    )
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > settings.BULK_IMPORT_MAX_BYTES:
+        raise too_large
+
+    chunks = []
+    received = 0
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > settings.BULK_IMPORT_MAX_BYTES:
+            raise too_large
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+async def _single_chunk(body: bytes) -> AsyncIterator[bytes]:
+    yield body
+
+
+def _read_csv(content: bytes) -> List[dict]:
+    """Parse CSV rows, treating empty cells as missing"""
+    try:
+        text = content.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="CSV file must be UTF-8"
+        )
+    return [
+        {key: value for key, value in row.items() if key and value not in (None, "")}
+        for row in csv.DictReader(io.StringIO(text))
+    ]
+
+
 @router.put("/transactions/{transaction_id}", response_model=Transaction)
 async def update_transaction(
-    transaction_id: str,
+    transaction_id: uuid.UUID,
     transaction_data: TransactionUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
     Update a transaction
     """
     try:
-        transaction = TransactionService.update_transaction(
+        transaction = await TransactionService.update_transaction(
             db, current_user.id, transaction_id, transaction_data
         )
         if not transaction:
@@ -120,14 +387,14 @@ async def update_transaction(
 
 @router.delete("/transactions/{transaction_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_transaction(
-    transaction_id: str,
+    transaction_id: uuid.UUID,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> None:
     """
     Delete a transaction
     """
-    success = TransactionService.delete_transaction(db, current_user.id, transaction_id)
+    success = await TransactionService.delete_transaction(db, current_user.id, transaction_id)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -3,24 +3,36 @@ User profile endpoints
 """
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.datastructures import UploadFile
+from starlette.formparsers import MultiPartException, MultiPartParser
 
+from app.core.config import settings
 from app.core.deps import get_db, get_current_user
 from app.models.models import User
 from app.schemas.schemas import UserUpdate, UserResponse
 from app.services.services import AuthService
+from app.utils.http_cache import conditional_get, version_etag
+from app.utils.photos import FORM_OVERHEAD_BYTES, PhotoTooLarge, limit_body
 
 router = APIRouter()
 
 
 @router.get("/profile", response_model=UserResponse)
 async def get_profile(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user)
 ) -> Any:
     """
     Get current user profile
     """
+    etag = version_etag("profile", current_user.id, current_user.updated_at)
+    not_modified = conditional_get(request, response, etag)
+    if not_modified:
+        return not_modified
+
     return UserResponse(
         id=str(current_user.id),
         fullName=current_user.full_name,
@@ -34,13 +46,13 @@ async def get_profile(
 async def update_profile(
     user_data: UserUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
     Update current user profile
     """
     try:
-        updated_user = AuthService.update_user(db, current_user.id, user_data)
+        updated_user = await AuthService.update_user(db, current_user.id, user_data)
         return UserResponse(
             id=str(updated_user.id),
             fullName=updated_user.full_name,
@@ -55,28 +67,68 @@ async def update_profile(
         )
 
 
-@router.post("/photo", response_model=UserResponse)
+# The body is parsed by the endpoint itself, so document the form here
+PHOTO_FORM_SCHEMA = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["photo"],
+                    "properties": {"photo": {"type": "string", "format": "binary"}},
+                }
+            }
+        },
+    }
+}
+
+
+@router.post("/photo", response_model=UserResponse, openapi_extra=PHOTO_FORM_SCHEMA)
 async def upload_profile_photo(
-    photo: UploadFile = File(...),
+    request: Request,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
     Upload profile photo
+
+    The multipart body is read as it arrives and rejected with 413 as soon
+    as it exceeds PHOTO_MAX_BYTES, rather than being buffered up front.
     """
+    max_body = settings.PHOTO_MAX_BYTES + FORM_OVERHEAD_BYTES
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_body:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(PhotoTooLarge())
+        )
+    if not request.headers.get("content-type", "").startswith("multipart/form-data"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Expected a multipart/form-data upload"
+        )
+
+    form = None
     try:
+        parser = MultiPartParser(request.headers, limit_body(request.stream(), max_body), max_files=1, max_fields=1)
+        form = await parser.parse()
+
         # Validate file type
-        if not photo.content_type.startswith("image/"):
+        photo = form.get("photo")
+        if not isinstance(photo, UploadFile):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Missing photo file"
+            )
+        if not (photo.content_type or "").startswith("image/"):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="File must be an image"
             )
 
-        # Read file content
-        photo_content = await photo.read()
-
         # Update user photo
-        updated_user = AuthService.update_user_photo(db, current_user.id, photo_content, photo.filename)
+        updated_user = await AuthService.update_user_photo(db, current_user.id, photo)
 
         return UserResponse(
             id=str(updated_user.id),
@@ -85,8 +137,16 @@ async def upload_profile_photo(
             dateOfBirth=updated_user.date_of_birth,
             photoUrl=updated_user.photo_url
         )
-    except ValueError as e:
+    except PhotoTooLarge as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
+    except (ValueError, MultiPartException) as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
-        )
\ No newline at end of file
+        )
+    finally:
+        if form is not None:
+            await form.close()
@@ -0,0 +1,157 @@
+"""
+Caching with an in-process TTL/LRU backend or a Redis-compatible backend
+"""
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from app.core.config import settings
+
+try:
+    import redis.asyncio as redis
+except ImportError:  # optional dependency, only needed for CACHE_BACKEND=redis
+    redis = None
+
+
+class MemoryBackend:
+    """
+    Per-process LRU cache with per-entry expiry. Entries are only shared
+    within one worker, so keep TTLs short when running several workers.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: Optional[int] = None) -> None:
+        expires_at = time.monotonic() + ttl if ttl else None
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+
+class RedisBackend:
+    """Cache stored in Redis (or any server speaking its protocol), shared by all workers"""
+
+    def __init__(self, url: str):
+        if redis is None:
+            raise RuntimeError("The redis package is required for CACHE_BACKEND=redis")
+        self._client = redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: Optional[int] = None) -> None:
+        await self._client.set(key, value, ex=ttl)
+
+    async def delete(self, key: str) -> None:
+        await self._client.delete(key)
+
+
+class Cache:
+    """
+    Named cache over a backend, counting hits and misses
+    """
+
+    def __init__(self, name: str, ttl: int, maxsize: int):
+        self.name = name
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        if settings.CACHE_BACKEND == "redis":
+            self.backend = RedisBackend(settings.REDIS_URL)
+        else:
+            self.backend = MemoryBackend(maxsize)
+
+    def _key(self, key: str) -> str:
+        return f"blui:{self.name}:{key}"
+
+    async def get(self, key: str) -> Optional[bytes]:
+        value = await self.backend.get(self._key(key))
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: Optional[int] = None) -> None:
+        await self.backend.set(self._key(key), value, ttl or self.ttl)
+
+    async def delete(self, key: str) -> None:
+        await self.backend.delete(self._key(key))
+
+
+# All caches, by name, for metrics
+caches: Dict[str, Cache] = {}
+
+
+def create_cache(name: str, ttl: int, maxsize: int) -> Cache:
+    """Create and register a named cache"""
+    cache = Cache(name, ttl, maxsize)
+    caches[name] = cache
+    return cache
+
+
+def render_cache_metrics() -> str:
+    """Hit/miss counters of every cache in Prometheus text format"""
+    lines = [
+        "# HELP blui_cache_hits_total Cache lookups that found an entry",
+        "# TYPE blui_cache_hits_total counter",
+    ]
+    lines += [f'blui_cache_hits_total{{cache="{name}"}} {cache.hits}' for name, cache in caches.items()]
+    lines += [
+        "# HELP blui_cache_misses_total Cache lookups that found nothing",
+        "# TYPE blui_cache_misses_total counter",
+    ]
+    lines += [f'blui_cache_misses_total{{cache="{name}"}} {cache.misses}' for name, cache in caches.items()]
+    return "\n".join(lines) + "\n"
+
+
+# Authenticated users, keyed by user id
+user_cache = create_cache("user", settings.USER_CACHE_TTL_SECONDS, settings.USER_CACHE_MAXSIZE)
+
+# Per-user data generations. A generation is a random token rather than a
+# counter, so an evicted or expired entry can never come back as an old value
+# and revive stale responses.
+generation_cache = create_cache(
+    "generation", settings.RESPONSE_CACHE_TTL_SECONDS * 2, settings.RESPONSE_CACHE_MAXSIZE
+)
+
+# Serialized JSON responses, keyed by user, generation, endpoint and params.
+# A write bumps the generation only in its own worker's memory backend, so
+# with several workers the responses are cached only in a shared backend.
+RESPONSE_CACHE_ENABLED = settings.CACHE_BACKEND == "redis" or settings.WEB_CONCURRENCY <= 1
+response_cache = create_cache(
+    "response", settings.RESPONSE_CACHE_TTL_SECONDS, settings.RESPONSE_CACHE_MAXSIZE
+)
+
+
+async def get_user_generation(user_id: str) -> str:
+    """Current data generation of a user, starting a new one if none is known"""
+    generation = await generation_cache.get(user_id)
+    if generation is None:
+        return await bump_user_generation(user_id)
+    return generation.decode()
+
+
+async def bump_user_generation(user_id: str) -> str:
+    """Start a new data generation, orphaning every cached response of the user"""
+    generation = uuid.uuid4().hex
+    await generation_cache.set(user_id, generation.encode())
+    return generation
@@ -50,9 +50,74 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = "sqlite:///./blui.db"
 
+    # Database pool (PostgreSQL; SQLite keeps SQLAlchemy's own pooling)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # Set when connecting through PgBouncer in transaction mode: disables
+    # asyncpg's prepared statement caches, which do not survive server switches
+    DB_PGBOUNCER: bool = False
+
     # JWT
     ALGORITHM: str = "HS256"
 
+    # Pagination
+    TRANSACTIONS_PAGE_SIZE: int = 100
+    TRANSACTIONS_PAGE_SIZE_MAX: int = 1000
+    TRANSACTIONS_STREAM_CHUNK_SIZE: int = 500
+    SEARCH_PAGE_SIZE: int = 20
+    GROUPED_PAGE_DAYS_MAX: int = 366
+
+    # Bulk import
+    BULK_IMPORT_MAX_ROWS: int = 10000
+    BULK_IMPORT_MAX_BYTES: int = 10 * 1024 * 1024
+    BULK_IMPORT_BATCH_SIZE: int = 1000
+
+    # Batch mutations
+    BATCH_MAX_OPERATIONS: int = 500
+
+    # Summary
+    SUMMARY_HISTORY_MONTHS: int = 12
+    SUMMARY_HISTORY_MAX_MONTHS: int = 120
+
+    # Delta sync: tokens overlap the previous sync by SYNC_OVERLAP_SECONDS so
+    # writes committed while a sync ran are not missed
+    SYNC_OVERLAP_SECONDS: int = 5
+    SYNC_TOMBSTONE_RETENTION_DAYS: int = 90
+
+    # Cache ("memory" per worker, or "redis" shared through REDIS_URL)
+    CACHE_BACKEND: str = "memory"
+    # Worker processes, as read by uvicorn and gunicorn. The response cache
+    # needs CACHE_BACKEND=redis when there is more than one.
+    WEB_CONCURRENCY: int = 1
+    REDIS_URL: Optional[str] = None
+    USER_CACHE_TTL_SECONDS: int = 60
+    USER_CACHE_MAXSIZE: int = 10000
+    RESPONSE_CACHE_TTL_SECONDS: int = 300
+    RESPONSE_CACHE_MAXSIZE: int = 10000
+
+    # SQL profiling (see app/core/profiling.py); the X-Profile-SQL header is
+    # only honoured in DEBUG with SQL_PROFILE_ALLOW_HEADER
+    SQL_PROFILE_ALLOW_HEADER: bool = False
+    SQL_PROFILE_SAMPLE_RATE: float = 0.0
+    SQL_PROFILE_TOP_N: int = 3
+    SLOW_QUERY_THRESHOLD_MS: float = 200
+
+    # Profile photos: uploads are streamed to UPLOAD_DIR in chunks, capped at
+    # PHOTO_MAX_BYTES, and resized to PHOTO_VARIANT_SIZES (longest side, px)
+    # in a pool of PHOTO_RESIZE_WORKERS threads
+    UPLOAD_DIR: str = "/app/uploads"
+    PHOTO_MAX_BYTES: int = 5 * 1024 * 1024
+    PHOTO_UPLOAD_CHUNK_SIZE: int = 64 * 1024
+    PHOTO_VARIANT_SIZES: List[int] = [64, 256]
+    PHOTO_RESIZE_WORKERS: int = 2
+
+    # Password hashing pool
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_LIMIT: int = 32
+
     class Config:
         env_file = ".env"
         case_sensitive = True
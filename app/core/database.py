@@ -1,21 +1,167 @@
 """
 Database connection and session management
 """
-from sqlalchemy import create_engine
+import time
+import uuid
+from typing import Any, Dict
+
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.core.config import settings
 
-# Create SQLAlchemy engine
+# asyncio drivers used for each database backend
+ASYNC_DRIVERS = {
+    "postgresql": "asyncpg",
+    "sqlite": "aiosqlite",
+}
+
+
+def get_async_database_url(database_url: str) -> URL:
+    """
+    Rewrite a sync database URL to use the matching asyncio driver
+    """
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend in ASYNC_DRIVERS:
+        url = url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+    return url
+
+
+def get_pool_options(database_url: str) -> Dict[str, Any]:
+    """
+    Pool arguments from settings. SQLite keeps SQLAlchemy's defaults
+    (a single static or per-connection pool), which are right for a file.
+    """
+    if make_url(database_url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def get_async_connect_args(database_url: str) -> Dict[str, Any]:
+    """
+    asyncpg arguments for PgBouncer transaction pooling: no statement caches
+    and unique prepared statement names, since consecutive statements may
+    run on different server connections
+    """
+    url = get_async_database_url(database_url)
+    if not settings.DB_PGBOUNCER or url.get_driver_name() != "asyncpg":
+        return {}
+    return {
+        "statement_cache_size": 0,
+        "prepared_statement_cache_size": 0,
+        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+    }
+
+
+class PoolStats:
+    """Connection pool counters for the API engine"""
+
+    def __init__(self):
+        self.checked_out = 0
+        self.connections_opened = 0
+        self.acquires = 0
+        self.acquire_seconds = 0.0
+        self.acquire_timeouts = 0
+
+
+pool_stats = PoolStats()
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long callers wait for a connection"""
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            pool_stats.acquire_timeouts += 1
+            raise
+        finally:
+            pool_stats.acquires += 1
+            pool_stats.acquire_seconds += time.perf_counter() - started
+
+
+# Create SQLAlchemy engine (used by migrations and scripts)
 engine = create_engine(
     settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
+    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {},
+    **get_pool_options(settings.DATABASE_URL)
 )
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Create async engine (used by the API)
+_async_pool_options = get_pool_options(settings.DATABASE_URL)
+if _async_pool_options:
+    _async_pool_options["poolclass"] = InstrumentedQueuePool
+async_engine = create_async_engine(
+    get_async_database_url(settings.DATABASE_URL),
+    connect_args=get_async_connect_args(settings.DATABASE_URL),
+    **_async_pool_options
+)
+
+
+@event.listens_for(async_engine.sync_engine, "connect")
+def _count_connect(dbapi_connection, connection_record):
+    pool_stats.connections_opened += 1
+
+
+@event.listens_for(async_engine.sync_engine, "checkout")
+def _count_checkout(dbapi_connection, connection_record, connection_proxy):
+    pool_stats.checked_out += 1
+
+
+@event.listens_for(async_engine.sync_engine, "checkin")
+def _count_checkin(dbapi_connection, connection_record):
+    pool_stats.checked_out -= 1
+
+
+def render_pool_metrics() -> str:
+    """API engine connection pool state in Prometheus text format"""
+    pool = async_engine.pool
+    size = pool.size() if isinstance(pool, AsyncAdaptedQueuePool) else 0
+    overflow = max(pool.overflow(), 0) if isinstance(pool, AsyncAdaptedQueuePool) else 0
+    metrics = [
+        ("blui_db_pool_size", "gauge", "Configured number of pooled connections", size),
+        ("blui_db_pool_checked_out", "gauge", "Connections currently in use", pool_stats.checked_out),
+        ("blui_db_pool_overflow", "gauge", "Connections open beyond the pool size", overflow),
+        ("blui_db_pool_connections_opened_total", "counter", "New database connections", pool_stats.connections_opened),
+        ("blui_db_pool_timeouts_total", "counter", "Checkouts that gave up after DB_POOL_TIMEOUT", pool_stats.acquire_timeouts),
+    ]
+    lines = []
+    for name, kind, help_text, value in metrics:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", f"{name} {value}"]
+    lines += [
+        "# HELP blui_db_pool_acquire_seconds Time spent waiting for a pooled connection",
+        "# TYPE blui_db_pool_acquire_seconds summary",
+        f"blui_db_pool_acquire_seconds_sum {round(pool_stats.acquire_seconds, 6)}",
+        f"blui_db_pool_acquire_seconds_count {pool_stats.acquires}",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+# Create AsyncSessionLocal class. Objects stay loaded after commit so that
+# responses can be serialized without lazy-loading on the event loop.
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 # Create Base class
 Base = declarative_base()
 
@@ -28,4 +174,4 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
@@ -1,30 +1,77 @@
 """
 FastAPI dependencies for authentication and database
 """
-from typing import Generator
+import json
+import uuid
+from datetime import datetime
+from typing import AsyncGenerator, Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 
-from app.core.database import SessionLocal
+from app.core.cache import user_cache
+from app.core.database import AsyncSessionLocal
 from app.core.security import verify_token
 from app.models.models import User
 
 
-def get_db() -> Generator[Session, None, None]:
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     Database dependency
     """
-    db = SessionLocal()
+    db = AsyncSessionLocal()
     try:
         yield db
     finally:
-        db.close()
+        await db.close()
 
 
-def get_current_user(
+# User columns kept in the cache; the password hash is deliberately left out
+USER_CACHE_FIELDS = (
+    "id", "full_name", "email", "date_of_birth", "photo_url",
+    "is_active", "created_at", "updated_at"
+)
+
+
+def _dump_user(user: User) -> bytes:
+    """Serialize the cached columns of a user"""
+    return json.dumps(
+        {field: getattr(user, field) for field in USER_CACHE_FIELDS}, default=str
+    ).encode()
+
+
+def _load_user(data: bytes) -> User:
+    """Rebuild a detached User from cached columns"""
+    values = json.loads(data)
+    values["id"] = uuid.UUID(values["id"])
+    for field in ("created_at", "updated_at"):
+        if values[field] is not None:
+            values[field] = datetime.fromisoformat(values[field])
+    user = User(**values)
+    make_transient_to_detached(user)
+    return user
+
+
+async def get_user(db: AsyncSession, user_id: str) -> Optional[User]:
+    """
+    Load a user by id, served from the user cache when possible
+    """
+    cached = await user_cache.get(user_id)
+    if cached is not None:
+        return _load_user(cached)
+
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalars().first()
+    if user is not None:
+        await user_cache.set(user_id, _dump_user(user))
+    return user
+
+
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(HTTPBearer()),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> User:
     """
     Get current authenticated user
@@ -39,7 +86,7 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await get_user(db, user_id)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -53,4 +100,4 @@ def get_current_user(
             detail="Inactive user"
         )
 
-    return user
\ No newline at end of file
+    return user
@@ -0,0 +1,233 @@
+"""
+Request and service metrics in Prometheus text format
+
+Metrics are kept per process. Each worker serves its own /metrics, so
+scrape every worker, or run a single worker per container.
+"""
+import functools
+import inspect
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+
+from app.core.database import async_engine
+
+# Latency buckets in seconds, spanning cached reads to slow exports
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{value}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class Metric:
+    """Base for labelled metrics"""
+
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        registry.append(self)
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(Metric):
+    """Monotonic counter"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        return self._header() + [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {value}"
+            for labels, value in self._values.items()
+        ]
+
+
+class Gauge(Counter):
+    """Value that goes up and down"""
+
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(Metric):
+    """Cumulative histogram with fixed buckets"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts..., +Inf count, sum]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, *labels: str, value: float) -> None:
+        series = self._values.get(labels)
+        if series is None:
+            series = self._values[labels] = [0] * (len(self.buckets) + 2)
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[index] += 1
+                break
+        else:
+            series[len(self.buckets)] += 1
+        series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        names = self.labelnames + ("le",)
+        for labels, series in self._values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), series):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(names, labels + (str(bound),))} {cumulative}")
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {round(series[-1], 6)}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+registry: List[Metric] = []
+
+http_requests_total = Counter(
+    "blui_http_requests_total", "HTTP requests by route and status", ("method", "route", "status")
+)
+http_request_duration_seconds = Histogram(
+    "blui_http_request_duration_seconds", "HTTP request latency by route", ("method", "route")
+)
+http_requests_in_progress = Gauge(
+    "blui_http_requests_in_progress", "HTTP requests being served", ("method",)
+)
+http_db_queries_total = Counter(
+    "blui_http_db_queries_total", "SQL statements executed while serving each route", ("method", "route")
+)
+service_call_duration_seconds = Histogram(
+    "blui_service_call_duration_seconds", "Service method latency", ("service", "method")
+)
+service_call_errors_total = Counter(
+    "blui_service_call_errors_total", "Service method calls that raised", ("service", "method")
+)
+
+
+def render_metrics() -> str:
+    """Every registered metric in Prometheus text format"""
+    lines: List[str] = []
+    for metric in registry:
+        lines += metric.render()
+    return "\n".join(lines) + "\n"
+
+
+# Statements executed during the current request, when one is being measured
+_request_queries: ContextVar[Optional[List[int]]] = ContextVar("request_queries", default=None)
+
+
+@event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    counter = _request_queries.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+def _route_template(scope) -> str:
+    """Path template of the matched route, so that ids do not explode label cardinality"""
+    app = scope.get("app")
+    endpoint = scope.get("endpoint")
+    if app is None or endpoint is None:
+        return "unmatched"
+    templates = getattr(app.state, "route_templates", None)
+    if templates is None:
+        templates = app.state.route_templates = {
+            route.endpoint: route.path for route in app.routes if hasattr(route, "endpoint")
+        }
+    return templates.get(endpoint, "unmatched")
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording count, latency and SQL statements per route,
+    and in-flight requests per method (the route is only known once the
+    router has run)
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        queries = [0]
+        token = _request_queries.set(queries)
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_progress.inc(method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            http_requests_in_progress.dec(method)
+            _request_queries.reset(token)
+            route = _route_template(scope)
+            http_requests_total.inc(method, route, str(status_code))
+            http_request_duration_seconds.observe(method, route, value=elapsed)
+            http_db_queries_total.inc(method, route, amount=queries[0])
+
+
+def instrument_service(cls):
+    """
+    Class decorator timing every async static method of a service.
+    Async generators (streams) are left alone: their work happens while
+    the response is being sent, which the request histogram already covers.
+    """
+    for attribute, value in list(vars(cls).items()):
+        if not isinstance(value, staticmethod) or not inspect.iscoroutinefunction(value.__func__):
+            continue
+        setattr(cls, attribute, staticmethod(_timed(cls.__name__, attribute, value.__func__)))
+    return cls
+
+
+def _timed(service: str, method: str, func):
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await func(*args, **kwargs)
+        except Exception:
+            service_call_errors_total.inc(service, method)
+            raise
+        finally:
+            service_call_duration_seconds.observe(service, method, value=time.perf_counter() - started)
+    return wrapper
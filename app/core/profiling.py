@@ -0,0 +1,151 @@
+"""
+Per-request SQL profiling and slow-query logging
+
+Every statement run by the API engine is timed. Statements slower than
+SLOW_QUERY_THRESHOLD_MS are always logged. A request picked by
+SQL_PROFILE_SAMPLE_RATE is profiled and logged as one JSON line with its
+query count, total DB time and slowest statements. A request sending the
+X-Profile-SQL header also gets those figures back as response headers, but
+only in DEBUG with SQL_PROFILE_ALLOW_HEADER, since they expose SQL text.
+"""
+import json
+import logging
+import random
+import re
+import time
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.core.database import async_engine
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile-sql"
+
+# Longest statement text kept in headers and logs
+STATEMENT_PREVIEW_LENGTH = 200
+
+
+def _preview(statement: str) -> str:
+    """Statement on one line, select list elided, truncated"""
+    statement = re.sub(r"\s+", " ", statement).strip()
+    statement = re.sub(r"^SELECT .+? FROM ", "SELECT ... FROM ", statement)
+    if len(statement) > STATEMENT_PREVIEW_LENGTH:
+        statement = statement[:STATEMENT_PREVIEW_LENGTH - 3] + "..."
+    return statement
+
+
+class RequestProfile:
+    """Statements executed while serving one request"""
+
+    def __init__(self):
+        self.query_count = 0
+        self.db_seconds = 0.0
+        self.statements: List[Tuple[float, str]] = []
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.query_count += 1
+        self.db_seconds += seconds
+        self.statements.append((seconds, statement))
+
+    def slowest(self) -> List[Tuple[float, str]]:
+        return sorted(self.statements, key=lambda item: item[0], reverse=True)[:settings.SQL_PROFILE_TOP_N]
+
+
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("current_profile", default=None)
+
+
+@event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+def _start_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info["query_started"] = time.perf_counter()
+
+
+@event.listens_for(async_engine.sync_engine, "after_cursor_execute")
+def _stop_timer(conn, cursor, statement, parameters, context, executemany):
+    seconds = time.perf_counter() - conn.info["query_started"]
+
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.record(statement, seconds)
+
+    if seconds * 1000 >= settings.SLOW_QUERY_THRESHOLD_MS:
+        logger.warning(json.dumps({
+            "event": "slow_query",
+            "duration_ms": round(seconds * 1000, 2),
+            "statement": _preview(statement),
+        }))
+
+
+def _wants_headers(scope) -> bool:
+    """Whether the request asked for profile headers and may have them"""
+    if settings.DEBUG and settings.SQL_PROFILE_ALLOW_HEADER:
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER and value not in (b"", b"0", b"false"):
+                return True
+    return False
+
+
+def _sampled() -> bool:
+    return settings.SQL_PROFILE_SAMPLE_RATE > 0 and random.random() < settings.SQL_PROFILE_SAMPLE_RATE
+
+
+class SQLProfilerMiddleware:
+    """
+    ASGI middleware profiling selected requests. Headers describe the work
+    done before the response started; for streamed responses the log line,
+    written when the request finishes, has the full figures.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        with_headers = scope["type"] == "http" and _wants_headers(scope)
+        if scope["type"] != "http" or not (with_headers or _sampled()):
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            if message["type"] == "http.response.start" and with_headers:
+                headers = list(message.get("headers", []))
+                headers += [
+                    (b"x-db-query-count", str(profile.query_count).encode()),
+                    (b"x-db-time-ms", f"{profile.db_seconds * 1000:.2f}".encode()),
+                    (b"x-request-time-ms", f"{(time.perf_counter() - started) * 1000:.2f}".encode()),
+                ]
+                for rank, (seconds, statement) in enumerate(profile.slowest(), start=1):
+                    headers.append((
+                        f"x-db-slowest-{rank}".encode(),
+                        f"{seconds * 1000:.2f}ms {_preview(statement)}".encode("latin-1", "replace")
+                    ))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_profile.reset(token)
+            logger.info(json.dumps({
+                "event": "sql_profile",
+                "method": scope["method"],
+                "path": scope["path"],
+                "status": status_code,
+                "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+                "query_count": profile.query_count,
+                "db_time_ms": round(profile.db_seconds * 1000, 2),
+                "slowest": [
+                    {"duration_ms": round(seconds * 1000, 2), "statement": _preview(statement)}
+                    for seconds, statement in profile.slowest()
+                ],
+            }))
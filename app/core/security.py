@@ -1,8 +1,10 @@
 """
 Authentication utilities for JWT tokens and password hashing
 """
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Callable, Optional
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
@@ -12,6 +14,19 @@ from app.core.config import settings
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt releases the GIL, so a thread pool keeps hashing off the event loop
+password_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash"
+)
+
+# Hashing jobs running or waiting in the pool (only touched from the event loop)
+password_hash_pending = 0
+
+
+class PasswordHashingBusy(Exception):
+    """Raised when the password hashing pool and its queue are full"""
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
@@ -27,6 +42,37 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def _run_in_hash_pool(func: Callable, *args):
+    """
+    Run a hashing function in the password hash pool, failing fast when
+    PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE_LIMIT jobs are already pending
+    """
+    global password_hash_pending
+    if password_hash_pending >= settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE_LIMIT:
+        raise PasswordHashingBusy("Too many authentication requests, try again shortly")
+
+    password_hash_pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(password_hash_executor, func, *args)
+    finally:
+        password_hash_pending -= 1
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password against its hash without blocking the event loop
+    """
+    return await _run_in_hash_pool(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    Hash a password without blocking the event loop
+    """
+    return await _run_in_hash_pool(get_password_hash, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """
     Create JWT access token
@@ -5,10 +5,15 @@ FastAPI Backend Application
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import PlainTextResponse
 
 from app.api.v1.api import api_router
+from app.core.cache import render_cache_metrics
 from app.core.config import settings
+from app.core.database import render_pool_metrics
+from app.core.metrics import MetricsMiddleware, render_metrics
+from app.core.profiling import SQLProfilerMiddleware
+from app.utils.photos import ImmutableStaticFiles
 
 app = FastAPI(
     title=settings.APP_NAME,
@@ -27,11 +32,17 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_headers=["*"],
     )
 
+# Profile SQL of sampled or X-Profile-SQL requests, log slow queries
+app.add_middleware(SQLProfilerMiddleware)
+
+# Record request metrics for /metrics
+app.add_middleware(MetricsMiddleware)
+
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
-# Mount static files for uploaded photos
-app.mount("/uploads", StaticFiles(directory="/app/uploads"), name="uploads")
+# Mount static files for uploaded photos (named by content hash, so immutable)
+app.mount("/uploads", ImmutableStaticFiles(directory=settings.UPLOAD_DIR), name="uploads")
 
 
 @app.get("/health")
@@ -39,6 +50,11 @@ async def health_check():
     """Health check endpoint for Docker health checks"""
     return {"status": "healthy", "service": "blui-backend"}
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus metrics"""
+    return render_metrics() + render_cache_metrics() + render_pool_metrics()
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to Blui Expense Tracker API"}
@@ -3,14 +3,59 @@ Database models using SQLAlchemy
 """
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, Boolean
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import BigInteger, Column, Enum, Integer, String, Date, DateTime, ForeignKey, Text, Boolean, Uuid, Index, DDL, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
+from sqlalchemy.types import TypeDecorator
+
+from app.utils.money import from_cents, to_cents
 
 Base = declarative_base()
 
 
+class UUID(TypeDecorator):
+    """
+    UUID column that is native on PostgreSQL and CHAR(32) on SQLite.
+
+    Services pass ids around as strings, so plain strings are coerced to
+    ``uuid.UUID`` before binding.
+    """
+
+    impl = Uuid
+    cache_ok = True
+
+    def __init__(self, as_uuid: bool = True):
+        super().__init__(as_uuid=as_uuid)
+
+    def process_bind_param(self, value, dialect):
+        if value is not None and not isinstance(value, uuid.UUID):
+            value = uuid.UUID(str(value))
+        return value
+
+
+class Money(TypeDecorator):
+    """
+    Exact amount stored as a BIGINT of minor units (cents).
+
+    Binds Decimal, int or float and returns Decimal with two places, so
+    sums and comparisons in SQL run on integers. The column type carries
+    through SUM and CASE, so aggregates come back as Decimal too.
+    """
+
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is not None:
+            value = to_cents(value)
+        return value
+
+    def process_result_value(self, value, dialect):
+        if value is not None:
+            value = from_cents(int(value))
+        return value
+
+
 class User(Base):
     __tablename__ = "users"
 
@@ -40,6 +85,11 @@ class Category(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Delta sync: range scan on the user's recent changes
+    __table_args__ = (
+        Index("ix_categories_user_id_updated_at", user_id, updated_at),
+    )
+
     # Relationships
     user = relationship("User", back_populates="categories")
     transactions = relationship("Transaction", back_populates="category")
@@ -51,14 +101,107 @@ class Transaction(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, index=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     category_id = Column(UUID(as_uuid=True), ForeignKey("categories.id"), nullable=False)
-    type = Column(String, nullable=False)
+    # The transaction_type enum of migration 001; asyncpg casts every bind to
+    # the column type, and PostgreSQL will not compare a VARCHAR to an enum
+    type = Column(Enum("income", "expense", name="transaction_type", create_type=False), nullable=False)
     name = Column(String, nullable=False)
-    amount = Column(Float, nullable=False)
-    date = Column(String, nullable=False)
+    amount = Column("amount_cents", Money, nullable=False)
+    date = Column(Date, nullable=False)
     note = Column(Text, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Serves every per-user listing: range scan on date, already in list order.
+    # The updated_at index serves delta sync.
+    __table_args__ = (
+        Index("ix_transactions_user_id_date", user_id, date.desc(), created_at.desc(), id.desc()),
+        Index("ix_transactions_user_id_updated_at", user_id, updated_at),
+    )
+
     # Relationships
     user = relationship("User", back_populates="transactions")
-    category = relationship("Category", back_populates="transactions")
\ No newline at end of file
+    # Never lazy-load: read paths join the category so listing stays one query
+    category = relationship("Category", back_populates="transactions", lazy="raise_on_sql")
+
+
+# Full-text search over name and note (TransactionService.search_transactions).
+# PostgreSQL: a generated tsvector column with a GIN index, and a trigram index
+# on name for fuzzy matches. SQLite: an FTS5 index over the table's rowid, kept
+# in step by triggers; rowids of this table are not stable across VACUUM, so
+# run "INSERT INTO transactions_fts(transactions_fts) VALUES ('rebuild')" after one.
+# Migration 006 creates the same objects on existing databases.
+TRANSACTION_SEARCH_DDL = {
+    "postgresql": [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        "ALTER TABLE transactions ADD COLUMN search_vector tsvector GENERATED ALWAYS AS "
+        "(setweight(to_tsvector('simple', name), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(note, '')), 'B')) STORED",
+        "CREATE INDEX ix_transactions_search_vector ON transactions USING gin (search_vector)",
+        "CREATE INDEX ix_transactions_name_trgm ON transactions USING gin (name gin_trgm_ops)",
+    ],
+    "sqlite": [
+        "CREATE VIRTUAL TABLE transactions_fts USING fts5("
+        "name, note, content='transactions', content_rowid='rowid', "
+        "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+        "CREATE TRIGGER transactions_fts_insert AFTER INSERT ON transactions BEGIN "
+        "INSERT INTO transactions_fts(rowid, name, note) VALUES (new.rowid, new.name, new.note); END",
+        "CREATE TRIGGER transactions_fts_delete AFTER DELETE ON transactions BEGIN "
+        "INSERT INTO transactions_fts(transactions_fts, rowid, name, note) "
+        "VALUES ('delete', old.rowid, old.name, old.note); END",
+        "CREATE TRIGGER transactions_fts_update AFTER UPDATE OF name, note ON transactions BEGIN "
+        "INSERT INTO transactions_fts(transactions_fts, rowid, name, note) "
+        "VALUES ('delete', old.rowid, old.name, old.note); "
+        "INSERT INTO transactions_fts(rowid, name, note) VALUES (new.rowid, new.name, new.note); END",
+    ],
+}
+
+for _dialect, _statements in TRANSACTION_SEARCH_DDL.items():
+    for _statement in _statements:
+        event.listen(Transaction.__table__, "after_create", DDL(_statement).execute_if(dialect=_dialect))
+event.listen(
+    Transaction.__table__, "after_drop",
+    DDL("DROP TABLE IF EXISTS transactions_fts").execute_if(dialect="sqlite")
+)
+
+
+class MonthlyCategoryTotal(Base):
+    """
+    Running totals per user, month, type and category, maintained by
+    TransactionService on every write so summaries never scan transactions.
+    """
+    __tablename__ = "monthly_category_totals"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    year = Column(Integer, nullable=False)
+    month = Column(Integer, nullable=False)
+    type = Column(String, nullable=False)
+    category_id = Column(UUID(as_uuid=True), ForeignKey("categories.id", ondelete="SET NULL"), nullable=True)
+    total = Column("total_cents", Money, nullable=False, default=0)
+    count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index(
+            "ix_monthly_category_totals_bucket",
+            "user_id", "year", "month", "type", "category_id",
+            unique=True
+        ),
+    )
+
+
+class Tombstone(Base):
+    """
+    Record of a hard-deleted category or transaction, kept so delta sync
+    can tell clients what to remove. Pruned after SYNC_TOMBSTONE_RETENTION_DAYS.
+    """
+    __tablename__ = "tombstones"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    entity = Column(String, nullable=False)  # "category" or "transaction"
+    entity_id = Column(UUID(as_uuid=True), nullable=False)
+    deleted_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_tombstones_user_id_deleted_at", user_id, deleted_at),
+    )
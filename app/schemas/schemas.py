@@ -1,11 +1,38 @@
 """
 Pydantic schemas for API request/response validation
 """
-from datetime import datetime
-from typing import Optional, List, Union
+from datetime import date as Date, datetime
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Annotated, Any, Dict, Optional, List, Union
 from uuid import UUID
 from uuid import UUID
-from pydantic import BaseModel, EmailStr, Field, field_serializer
+from pydantic import AfterValidator, BaseModel, BeforeValidator, EmailStr, Field, PlainSerializer, field_serializer, model_validator
+
+from app.utils.money import CENT, parse_amount
+
+def _check_uuid(value: str) -> str:
+    UUID(value)
+    return value
+
+
+# Id sent by clients as a string; malformed ids fail validation instead of the query
+UUIDString = Annotated[str, AfterValidator(_check_uuid)]
+
+# Exact money amount: Decimal in Python, a JSON number on the wire
+Amount = Annotated[Decimal, PlainSerializer(float, return_type=float, when_used="json")]
+
+def _round_to_cent(value: Any) -> Any:
+    try:
+        amount = parse_amount(value)
+    except (TypeError, ValueError):
+        # Left for the Decimal validation to reject
+        return value
+    return amount.quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+# Amount sent by clients: rounded half up to whole cents before the field's
+# bounds are checked, and small enough for sums to fit a BIGINT of cents
+AmountInput = Annotated[Amount, BeforeValidator(_round_to_cent), Field(max_digits=15, decimal_places=2)]
 
 
 # User schemas
@@ -126,9 +153,9 @@ class CategoriesListResponse(BaseModel):
 class TransactionBase(BaseModel):
     type: str = Field(..., pattern="^(income|expense)$")
     name: str = Field(..., min_length=1, max_length=100)
-    category_id: str = Field(..., alias="categoryId")
-    amount: float = Field(..., gt=0)
-    date: str = Field(..., pattern=r"^\d{4}-\d{2}-\d{2}$")  # YYYY-MM-DD format
+    category_id: UUIDString = Field(..., alias="categoryId")
+    amount: AmountInput = Field(..., gt=0)
+    date: Date  # YYYY-MM-DD format
     note: Optional[str] = None
 
     class Config:
@@ -141,14 +168,51 @@ class TransactionCreate(TransactionBase):
 
 class TransactionUpdate(BaseModel):
     name: Optional[str] = Field(None, min_length=1, max_length=100)
-    category_id: Optional[str] = Field(None, alias="categoryId")
-    amount: Optional[float] = Field(None, gt=0)
-    date: Optional[str] = Field(None, pattern=r"^\d{4}-\d{2}-\d{2}$")
+    category_id: Optional[UUIDString] = Field(None, alias="categoryId")
+    amount: Optional[AmountInput] = Field(None, gt=0)
+    date: Optional[Date] = None
     note: Optional[str] = None
 
     class Config:
         populate_by_name = True
 
+    @model_validator(mode="after")
+    def check_nulls(self) -> "TransactionUpdate":
+        # Omitted fields are left alone; only the note can be cleared
+        for field in self.model_fields_set - {"note"}:
+            if getattr(self, field) is None:
+                raise ValueError(f"{self.model_fields[field].alias or field} cannot be null")
+        return self
+
+
+class TransactionFilter(BaseModel):
+    """
+    Filters for reading transactions. Every field given narrows the result
+    (they combine with AND); sort picks the order.
+    """
+    type: Optional[str] = Field(None, pattern="^(income|expense)$")
+    category_ids: Optional[List[UUID]] = None
+    min_amount: Optional[AmountInput] = Field(None, ge=0)
+    max_amount: Optional[AmountInput] = Field(None, ge=0)
+    month: Optional[int] = Field(None, ge=1, le=12)
+    year: Optional[int] = Field(None, ge=2000, le=2100)
+    date: Optional[Date] = None
+    start_date: Optional[Date] = None
+    end_date: Optional[Date] = None
+    # Case-insensitive substring of the name or note
+    text: Optional[str] = Field(None, min_length=1, max_length=100)
+    sort: str = Field("date_desc", pattern="^(date|amount)_(asc|desc)$")
+
+    @model_validator(mode="after")
+    def check_ranges(self) -> "TransactionFilter":
+        if (self.month is None) != (self.year is None):
+            raise ValueError("month and year must be given together")
+        if self.min_amount is not None and self.max_amount is not None and self.min_amount > self.max_amount:
+            raise ValueError("min_amount must not be greater than max_amount")
+        if self.start_date and self.end_date and self.start_date > self.end_date:
+            raise ValueError("start_date must not be after end_date")
+        return self
+
 
 class Transaction(TransactionBase):
     id: Union[str, UUID]
@@ -169,8 +233,48 @@ class Transaction(TransactionBase):
         populate_by_name = True
 
 
+class BulkImportError(BaseModel):
+    index: int
+    error: str
+
+
+class BulkImportResponse(BaseModel):
+    created: int
+    errors: List[BulkImportError]
+
+
+class BatchOperation(BaseModel):
+    op: str = Field(..., pattern="^(create|update|delete)$")
+    entity: str = Field(..., pattern="^(transaction|category)$")
+    # Target of update/delete; optional client-generated UUID for create
+    id: Optional[str] = None
+    data: Optional[Dict[str, Any]] = None
+
+
+class BatchRequest(BaseModel):
+    operations: List[BatchOperation]
+    # Apply nothing if any operation fails
+    atomic: bool = False
+
+
+class BatchResult(BaseModel):
+    index: int
+    ok: bool
+    id: Optional[str] = None
+    error: Optional[str] = None
+
+
+class BatchResponse(BaseModel):
+    results: List[BatchResult]
+    applied: int
+
+
 class TransactionsListResponse(BaseModel):
     transactions: List[Transaction]
+    next_cursor: Optional[str] = Field(None, alias="nextCursor")
+
+    class Config:
+        populate_by_name = True
 
 
 # Summary schemas
@@ -179,7 +283,7 @@ class CategorySummary(BaseModel):
     category_name: str = Field(..., alias="categoryName")
     category_icon: str = Field(..., alias="categoryIcon")
     category_color: str = Field(..., alias="categoryColor")
-    total: float
+    total: Amount
     percentage: float
 
     @field_serializer('category_id')
@@ -196,9 +300,9 @@ class BalanceSummaryResponse(BaseModel):
     user_id: Union[str, UUID] = Field(..., alias="userId")
     month: int = Field(..., ge=1, le=12)
     year: int = Field(..., ge=2000, le=2100)
-    balance: float
-    total_income: float = Field(..., alias="totalIncome")
-    total_expense: float = Field(..., alias="totalExpense")
+    balance: Amount
+    total_income: Amount = Field(..., alias="totalIncome")
+    total_expense: Amount = Field(..., alias="totalExpense")
     income_by_category: Optional[List[CategorySummary]] = Field(None, alias="incomeByCategory")
     expense_by_category: Optional[List[CategorySummary]] = Field(None, alias="expenseByCategory")
 
@@ -218,14 +322,35 @@ class MonthlySummaryListResponse(BaseModel):
 
 # Grouped transactions
 class TransactionsByDateResponse(BaseModel):
-    date: str
+    date: Date
     transactions: List[Transaction]
-    total_income: float = Field(..., alias="totalIncome")
-    total_expense: float = Field(..., alias="totalExpense")
+    total_income: Amount = Field(..., alias="totalIncome")
+    total_expense: Amount = Field(..., alias="totalExpense")
 
     class Config:
         populate_by_name = True
 
 
 class GroupedTransactionsResponse(BaseModel):
-    groups: List[TransactionsByDateResponse]
\ No newline at end of file
+    groups: List[TransactionsByDateResponse]
+    next_cursor: Optional[str] = Field(None, alias="nextCursor")
+
+    class Config:
+        populate_by_name = True
+
+
+# Delta sync schemas
+class SyncDeleted(BaseModel):
+    categories: List[str]
+    transactions: List[str]
+
+
+class SyncResponse(BaseModel):
+    categories: List[Category]
+    transactions: List[Transaction]
+    deleted: SyncDeleted
+    next_token: str = Field(..., alias="nextToken")
+    full_sync: bool = Field(..., alias="fullSync")
+
+    class Config:
+        populate_by_name = True
@@ -1,35 +1,82 @@
 """
 Business logic services
 """
+import re
 import uuid
-from datetime import datetime
-from typing import List, Optional, Union
+from datetime import date as Date, datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple, Union
 
-from sqlalchemy.orm import Session
+from pydantic import ValidationError
+from sqlalchemy import (
+    ColumnElement, Row, Select, and_, case, column, delete, extract, func, insert, literal, literal_column, or_,
+    select, table, tuple_
+)
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from starlette.datastructures import UploadFile
 
-from app.core.security import get_password_hash, verify_password, create_access_token
+from app.core.cache import bump_user_generation, user_cache
+from app.core.security import get_password_hash_async, verify_password_async, create_access_token
 from app.core.config import settings
-from app.models.models import User, Category, Transaction
+from app.core.metrics import instrument_service
+from app.models.models import User, Category, Transaction, MonthlyCategoryTotal, Tombstone
 from app.schemas.schemas import (
     UserCreate, UserUpdate, CategoryCreate, TransactionCreate, TransactionUpdate,
-    BalanceSummaryResponse, CategorySummary, TransactionsByDateResponse
+    BalanceSummaryResponse, CategorySummary, TransactionsByDateResponse, BulkImportError,
+    BatchOperation, BatchResult, TransactionFilter
 )
+from app.utils.money import parse_amount
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.utils.photos import photo_url, remove_photo_async, save_upload, store_photo_async, stored_filename
+
+# Words of a search query beyond this are ignored
+SEARCH_MAX_TERMS = 8
+
+# SQLite ranking: a match in the name counts this many times a match in the note
+# (PostgreSQL weighs them through the A/B weights of search_vector)
+SEARCH_NAME_WEIGHT = 4.0
+
 
+def format_validation_error(e: ValidationError) -> str:
+    """One-line summary of a Pydantic validation error"""
+    return "; ".join(
+        f"{'.'.join(map(str, err['loc']))}: {err['msg']}" if err["loc"] else err["msg"]
+        for err in e.errors()
+    )
 
+
+def parse_timestamp(value: str) -> datetime:
+    """
+    Naive UTC datetime from an ISO string. The models declare naive
+    DateTime columns, which asyncpg refuses to bind aware datetimes to,
+    while PostgreSQL reads the migrated timestamptz columns back as aware.
+    """
+    moment = datetime.fromisoformat(value)
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment
+
+
+@instrument_service
 class AuthService:
     """Authentication service"""
 
     @staticmethod
-    def register_user(db: Session, user_data: UserCreate) -> User:
+    async def register_user(db: AsyncSession, user_data: UserCreate) -> User:
         """Register a new user"""
         # Check if email already exists
-        existing_user = db.query(User).filter(User.email == user_data.email).first()
+        result = await db.execute(select(User).where(User.email == user_data.email))
+        existing_user = result.scalars().first()
         if existing_user:
             raise ValueError("Email already registered")
 
         # Create new user
         user_id = str(uuid.uuid4())
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await get_password_hash_async(user_data.password)
 
         user = User(
             id=user_id,
@@ -41,24 +88,26 @@ class AuthService:
         )
 
         db.add(user)
-        db.commit()
-        db.refresh(user)
+        await db.commit()
+        await db.refresh(user)
         return user
 
     @staticmethod
-    def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
+    async def authenticate_user(db: AsyncSession, email: str, password: str) -> Optional[User]:
         """Authenticate user with email and password"""
-        user = db.query(User).filter(User.email == email).first()
+        result = await db.execute(select(User).where(User.email == email))
+        user = result.scalars().first()
         if not user:
             return None
-        if not verify_password(password, user.hashed_password):
+        if not await verify_password_async(password, user.hashed_password):
             return None
         return user
 
     @staticmethod
-    def update_user(db: Session, user_id: Union[str, uuid.UUID], user_data: UserUpdate) -> User:
+    async def update_user(db: AsyncSession, user_id: Union[str, uuid.UUID], user_data: UserUpdate) -> User:
         """Update user profile"""
-        user = db.query(User).filter(User.id == user_id).first()
+        result = await db.execute(select(User).where(User.id == user_id))
+        user = result.scalars().first()
         if not user:
             raise ValueError("User not found")
 
@@ -67,179 +116,538 @@ class AuthService:
             setattr(user, field, value)
 
         user.updated_at = datetime.utcnow()
-        db.commit()
-        db.refresh(user)
+        await db.commit()
+        await db.refresh(user)
+        await user_cache.delete(str(user_id))
         return user
 
     @staticmethod
-    def update_user_photo(db: Session, user_id: Union[str, uuid.UUID], photo_content: bytes, filename: str) -> User:
-        """Update user profile photo"""
-        import os
-        from pathlib import Path
-
-        user = db.query(User).filter(User.id == user_id).first()
+    async def update_user_photo(db: AsyncSession, user_id: Union[str, uuid.UUID], photo: UploadFile) -> User:
+        """
+        Update user profile photo. The upload is streamed to disk, resized in
+        the photo pool and stored under its content hash. The previous photo
+        is deleted only after the new URL is committed, and only if the row
+        no longer points at it.
+        """
+        result = await db.execute(select(User).where(User.id == user_id))
+        user = result.scalars().first()
         if not user:
             raise ValueError("User not found")
 
-        uploads_dir = Path("/app/uploads")
-        user_dir = uploads_dir / str(user_id)
-        user_dir.mkdir(parents=True, exist_ok=True)
+        user_dir = Path(settings.UPLOAD_DIR) / str(user_id)
+        old_filename = stored_filename(user.photo_url, str(user_id))
+        temp_path, content_hash = await save_upload(photo, user_dir)
+        filename = await store_photo_async(temp_path, user_dir, content_hash)
 
-        file_extension = Path(filename).suffix.lower()
-        if file_extension not in ['.jpg', '.jpeg', '.png', '.gif']:
-            file_extension = '.jpg'  # default to jpg
-
-        unique_filename = f"profile_{str(user_id)}{file_extension}"
-        file_path = user_dir / unique_filename
-
-        with open(file_path, "wb") as f:
-            f.write(photo_content)
-
-        photo_url = f"{settings.PHOTO_BASE_URL}/uploads/{str(user_id)}/{unique_filename}"
-
-        user.photo_url = photo_url
+        user.photo_url = photo_url(str(user_id), filename)
         user.updated_at = datetime.utcnow()
-        db.commit()
-        db.refresh(user)
+        try:
+            await db.commit()
+        except BaseException:
+            if filename != old_filename:
+                await remove_photo_async(user_dir, filename)
+            raise
+        await db.refresh(user)
+        await user_cache.delete(str(user_id))
+
+        # A concurrent upload may have committed since; keep what the row references
+        if old_filename and old_filename != stored_filename(user.photo_url, str(user_id)):
+            await remove_photo_async(user_dir, old_filename)
         return user
 
 
+@instrument_service
 class CategoryService:
     """Category service"""
 
     @staticmethod
-    def get_user_categories(db: Session, user_id: Union[str, uuid.UUID]) -> List[Category]:
+    async def get_user_categories(db: AsyncSession, user_id: Union[str, uuid.UUID]) -> List[Category]:
         """Get all categories for a user"""
-        return db.query(Category).filter(Category.user_id == user_id).all()
+        result = await db.execute(select(Category).where(Category.user_id == user_id))
+        return result.scalars().all()
 
     @staticmethod
-    def create_category(db: Session, user_id: Union[str, uuid.UUID], category_data: CategoryCreate) -> Category:
-        """Create a new category"""
-        category_id = str(uuid.uuid4())
+    async def get_categories_version(db: AsyncSession, user_id: Union[str, uuid.UUID]) -> Tuple:
+        """Row count and latest update of a user's categories, for building ETags"""
+        result = await db.execute(
+            select(func.count(Category.id), func.max(Category.updated_at))
+            .where(Category.user_id == user_id)
+        )
+        return tuple(result.one())
+
+    @staticmethod
+    def add_category(
+        db: AsyncSession,
+        user_id: Union[str, uuid.UUID],
+        category_data: CategoryCreate,
+        category_id: Optional[uuid.UUID] = None
+    ) -> Category:
+        """Stage a new category in the session without committing"""
         category = Category(
-            id=category_id,
+            id=category_id or uuid.uuid4(),
             user_id=user_id,
             name=category_data.name,
             icon=category_data.icon,
             color=category_data.color
         )
-
         db.add(category)
-        db.commit()
-        db.refresh(category)
         return category
 
     @staticmethod
-    def delete_category(db: Session, user_id: Union[str, uuid.UUID], category_id: Union[str, uuid.UUID]) -> bool:
+    async def create_category(db: AsyncSession, user_id: Union[str, uuid.UUID], category_data: CategoryCreate) -> Category:
+        """Create a new category"""
+        category = CategoryService.add_category(db, user_id, category_data)
+        await db.commit()
+        await db.refresh(category)
+        return category
+
+    @staticmethod
+    async def remove_category(db: AsyncSession, user_id: Union[str, uuid.UUID], category: Category) -> None:
+        """
+        Stage deleting a category, leaving a tombstone for sync, without
+        committing. Raises ValueError if transactions still use it.
+        """
+        # Flush first so transactions staged earlier in the session count
+        await db.flush()
+        result = await db.execute(
+            select(func.count()).select_from(Transaction).where(Transaction.category_id == category.id)
+        )
+        if result.scalar():
+            raise ValueError("Category still has transactions")
+        await db.delete(category)
+        db.add(Tombstone(user_id=user_id, entity="category", entity_id=category.id))
+
+    @staticmethod
+    async def delete_category(db: AsyncSession, user_id: Union[str, uuid.UUID], category_id: Union[str, uuid.UUID]) -> bool:
         """Delete a category"""
-        category = db.query(Category).filter(
+        result = await db.execute(select(Category).where(
             Category.id == category_id,
             Category.user_id == user_id
-        ).first()
+        ))
+        category = result.scalars().first()
 
         if not category:
             return False
 
-        db.delete(category)
-        db.commit()
+        await CategoryService.remove_category(db, user_id, category)
+        await db.commit()
+        # Summaries and grouped transactions show category names
+        await bump_user_generation(str(user_id))
         return True
 
 
+@instrument_service
 class TransactionService:
     """Transaction service"""
 
+    # Sort field -> keyset columns, most significant first (see _sort_keys)
+    _SORT_KEYS = {
+        "date": (Transaction.date, Transaction.created_at, Transaction.id),
+        "amount": (Transaction.amount, Transaction.id),
+    }
+
+    # Keyset column -> parser for its value in a page cursor
+    _CURSOR_PARSERS = {
+        "date": Date.fromisoformat,
+        "created_at": parse_timestamp,
+        "amount": parse_amount,
+        "id": uuid.UUID,
+    }
+
+    @staticmethod
+    def _month_filter(month: int, year: int) -> ColumnElement[bool]:
+        """Half-open range predicate matching transactions dated in the given month"""
+        next_month = Date(year + 1, 1, 1) if month == 12 else Date(year, month + 1, 1)
+        return and_(Transaction.date >= Date(year, month, 1), Transaction.date < next_month)
+
     @staticmethod
-    def get_user_transactions(
-        db: Session,
+    def _filter_criteria(
         user_id: Union[str, uuid.UUID],
-        month: Optional[int] = None,
-        year: Optional[int] = None,
-        date: Optional[str] = None,
-        start_date: Optional[str] = None,
-        end_date: Optional[str] = None
-    ) -> List[Transaction]:
-        """Get transactions with optional filters"""
-        query = db.query(Transaction).filter(Transaction.user_id == user_id)
-
-        if month and year:
-            query = query.filter(
-                Transaction.date.like(f"{year}-{month:02d}-%")
-            )
-        elif date:
-            query = query.filter(Transaction.date == date)
-        elif start_date and end_date:
-            query = query.filter(Transaction.date.between(start_date, end_date))
-        elif start_date:
-            query = query.filter(Transaction.date >= start_date)
-        elif end_date:
-            query = query.filter(Transaction.date <= end_date)
+        filters: Optional[TransactionFilter] = None
+    ) -> List[ColumnElement]:
+        """
+        WHERE criteria for the given filters. Dates bound the
+        (user_id, date) index range; the other filters are checked on the
+        rows of that range.
+        """
+        criteria = [Transaction.user_id == user_id]
+        if filters is None:
+            return criteria
+
+        if filters.month is not None:
+            criteria.append(TransactionService._month_filter(filters.month, filters.year))
+        if filters.date is not None:
+            criteria.append(Transaction.date == filters.date)
+        if filters.start_date is not None:
+            criteria.append(Transaction.date >= filters.start_date)
+        if filters.end_date is not None:
+            criteria.append(Transaction.date <= filters.end_date)
+        if filters.type is not None:
+            criteria.append(Transaction.type == filters.type)
+        if filters.category_ids:
+            criteria.append(Transaction.category_id.in_(filters.category_ids))
+        if filters.min_amount is not None:
+            criteria.append(Transaction.amount >= filters.min_amount)
+        if filters.max_amount is not None:
+            criteria.append(Transaction.amount <= filters.max_amount)
+        if filters.text:
+            criteria.append(or_(
+                Transaction.name.icontains(filters.text, autoescape=True),
+                Transaction.note.icontains(filters.text, autoescape=True)
+            ))
+
+        return criteria
 
-        return query.order_by(Transaction.date.desc(), Transaction.created_at.desc()).all()
+    @staticmethod
+    def _sort_keys(filters: Optional[TransactionFilter] = None) -> Tuple[tuple, bool]:
+        """Keyset columns of the requested order, and whether it is descending"""
+        field, direction = (filters.sort if filters else "date_desc").split("_")
+        return TransactionService._SORT_KEYS[field], direction == "desc"
+
+    @staticmethod
+    def _apply_filters(
+        query: Select,
+        user_id: Union[str, uuid.UUID],
+        filters: Optional[TransactionFilter] = None
+    ) -> Select:
+        """Restrict a transaction query to the given filters, in the requested order (newest first by default)"""
+        keys, descending = TransactionService._sort_keys(filters)
+        query = query.where(*TransactionService._filter_criteria(user_id, filters))
+        return query.order_by(*(key.desc() if descending else key.asc() for key in keys))
 
     @staticmethod
-    def get_grouped_transactions(
-        db: Session,
+    def _filtered_query(
         user_id: Union[str, uuid.UUID],
-        month: Optional[int] = None,
-        year: Optional[int] = None,
-        start_date: Optional[str] = None,
-        end_date: Optional[str] = None
-    ) -> List[TransactionsByDateResponse]:
-        """Get transactions grouped by date"""
-        transactions = TransactionService.get_user_transactions(
-            db, user_id, month, year, None, start_date, end_date
+        filters: Optional[TransactionFilter] = None
+    ) -> Select:
+        """Build the transaction query for the given filters"""
+        query = select(Transaction).options(joinedload(Transaction.category))
+        return TransactionService._apply_filters(query, user_id, filters)
+
+    @staticmethod
+    def _plain_query(
+        user_id: Union[str, uuid.UUID],
+        filters: Optional[TransactionFilter] = None
+    ) -> Select:
+        """
+        Like _filtered_query, but selecting plain columns (the category's
+        prefixed with category_) so rows can be serialized without building
+        ORM objects or Pydantic models
+        """
+        query = select(
+            Transaction.id,
+            Transaction.user_id,
+            Transaction.category_id,
+            Transaction.type,
+            Transaction.name,
+            Transaction.amount,
+            Transaction.date,
+            Transaction.note,
+            Transaction.created_at,
+            Transaction.updated_at,
+            Category.id.label("category_ref"),
+            Category.user_id.label("category_user_id"),
+            Category.name.label("category_name"),
+            Category.icon.label("category_icon"),
+            Category.color.label("category_color"),
+            Category.created_at.label("category_created_at"),
+            Category.updated_at.label("category_updated_at")
+        ).outerjoin(Category, Category.id == Transaction.category_id)
+        return TransactionService._apply_filters(query, user_id, filters)
+
+    @staticmethod
+    async def get_transactions_version(
+        db: AsyncSession,
+        user_id: Union[str, uuid.UUID],
+        filters: Optional[TransactionFilter] = None
+    ) -> Tuple:
+        """
+        Row count and latest update of the filtered transactions and of the
+        user's categories (whose names are embedded), for building ETags
+        """
+        own_categories = Category.user_id == user_id
+        result = await db.execute(
+            select(
+                func.count(Transaction.id),
+                func.max(Transaction.updated_at),
+                select(func.count(Category.id)).where(own_categories).scalar_subquery(),
+                select(func.max(Category.updated_at)).where(own_categories).scalar_subquery()
+            ).where(*TransactionService._filter_criteria(user_id, filters))
         )
+        return tuple(result.one())
 
-        # Group by date
-        grouped = {}
-        for transaction in transactions:
-            date = transaction.date
-            if date not in grouped:
-                grouped[date] = []
-            grouped[date].append(transaction)
+    @staticmethod
+    async def get_user_transactions(
+        db: AsyncSession,
+        user_id: Union[str, uuid.UUID],
+        filters: Optional[TransactionFilter] = None,
+        plain: bool = False
+    ) -> List[Union[Transaction, Row]]:
+        """
+        Get transactions with optional filters. With plain=True, returns
+        column rows (see _plain_query) instead of ORM objects.
+        """
+        if plain:
+            result = await db.execute(TransactionService._plain_query(user_id, filters))
+            return result.all()
 
-        # Convert to response format
-        result = []
-        for date, txns in grouped.items():
-            total_income = sum(t.amount for t in txns if t.type == "income")
-            total_expense = sum(t.amount for t in txns if t.type == "expense")
-
-            result.append(TransactionsByDateResponse(
-                date=date,
-                transactions=txns,
-                total_income=total_income,
-                total_expense=total_expense
-            ))
+        result = await db.execute(TransactionService._filtered_query(user_id, filters))
+        return result.scalars().all()
 
-        # Sort by date descending
-        result.sort(key=lambda x: x.date, reverse=True)
-        return result
+    @staticmethod
+    async def get_transactions_page(
+        db: AsyncSession,
+        user_id: Union[str, uuid.UUID],
+        limit: int,
+        cursor: Optional[str] = None,
+        filters: Optional[TransactionFilter] = None,
+        plain: bool = False
+    ) -> Tuple[List[Union[Transaction, Row]], Optional[str]]:
+        """
+        Get one page of transactions using keyset pagination on the sort
+        columns ((date, created_at, id) by default). Returns the page and the
+        cursor for the next page, or None when there are no more rows. With
+        plain=True the page holds column rows instead of ORM objects.
+        """
+        build_query = TransactionService._plain_query if plain else TransactionService._filtered_query
+        query = build_query(user_id, filters)
+        keys, descending = TransactionService._sort_keys(filters)
+
+        if cursor:
+            values = decode_cursor(cursor)
+            if len(values) != len(keys):
+                raise ValueError("Invalid cursor")
+            try:
+                # Typed like the columns, so amounts are bound as cents
+                last = [
+                    literal(TransactionService._CURSOR_PARSERS[key.key](value), key.type)
+                    for key, value in zip(keys, values)
+                ]
+            except (TypeError, ValueError):
+                raise ValueError("Invalid cursor")
+            query = query.where(tuple_(*keys) < tuple_(*last) if descending else tuple_(*keys) > tuple_(*last))
+
+        result = await db.execute(query.limit(limit + 1))
+        transactions = list(result.all() if plain else result.scalars().all())
+
+        next_cursor = None
+        if len(transactions) > limit:
+            transactions = transactions[:limit]
+            last_row = transactions[-1]
+            next_cursor = encode_cursor([
+                value.isoformat() if isinstance(value, (Date, datetime)) else value
+                for value in (getattr(last_row, key.key) for key in keys)
+            ])
+        return transactions, next_cursor
+
+    @staticmethod
+    def _search_terms(query: str) -> List[str]:
+        """Words of a search query, lowercased; punctuation is dropped"""
+        return re.findall(r"\w+", query.lower())[:SEARCH_MAX_TERMS]
 
     @staticmethod
-    def get_transaction_by_id(db: Session, user_id: Union[str, uuid.UUID], transaction_id: Union[str, uuid.UUID]) -> Optional[Transaction]:
+    async def search_transactions(
+        db: AsyncSession,
+        user_id: Union[str, uuid.UUID],
+        query: str,
+        limit: int,
+        cursor: Optional[str] = None,
+        filters: Optional[TransactionFilter] = None
+    ) -> Tuple[List[Row], Optional[str]]:
+        """
+        Rank the user's transactions against a search query on name and note,
+        within the given filters (whose sort order is ignored). Every word
+        must match, as a prefix, so results follow the user's typing. On
+        PostgreSQL names within trigram distance of the query also match, so
+        typos still find results. Returns plain rows (as _plain_query) and
+        the cursor of the next page.
+        """
+        terms = TransactionService._search_terms(query)
+        if not terms:
+            return [], None
+
+        offset = 0
+        if cursor:
+            values = decode_cursor(cursor)
+            if len(values) != 1 or not isinstance(values[0], int) or values[0] < 0:
+                raise ValueError("Invalid cursor")
+            offset = values[0]
+
+        statement = TransactionService._plain_query(user_id, filters).order_by(None)
+
+        if db.bind.dialect.name == "postgresql":
+            search_vector = literal_column("transactions.search_vector")
+            tsquery = func.to_tsquery(
+                literal_column("'simple'::regconfig"), " & ".join(f"{term}:*" for term in terms)
+            )
+            statement = statement.where(
+                search_vector.op("@@")(tsquery) | Transaction.name.op("%")(query)
+            ).order_by((func.ts_rank(search_vector, tsquery) + func.similarity(Transaction.name, query)).desc())
+        else:
+            fts = table("transactions_fts", column("rowid"))
+            fts_table = literal_column("transactions_fts")
+            match = " ".join(f'"{term}"*' for term in terms)
+            statement = statement.join(
+                fts, fts.c.rowid == literal_column("transactions.rowid")
+            ).where(
+                fts_table.op("MATCH")(match)
+            ).order_by(func.bm25(fts_table, SEARCH_NAME_WEIGHT, 1.0))
+
+        statement = statement.order_by(Transaction.date.desc(), Transaction.id.desc())
+        result = await db.execute(statement.offset(offset).limit(limit + 1))
+        rows = list(result.all())
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor([offset + limit])
+        return rows, next_cursor
+
+    @staticmethod
+    async def stream_user_transactions(
+        db: AsyncSession,
+        user_id: Union[str, uuid.UUID],
+        filters: Optional[TransactionFilter] = None,
+        chunk_size: int = settings.TRANSACTIONS_STREAM_CHUNK_SIZE
+    ) -> AsyncIterator[Transaction]:
+        """
+        Yield transactions from a server-side cursor, fetching chunk_size
+        rows at a time so memory does not grow with the result size
+        """
+        query = TransactionService._filtered_query(user_id, filters)
+        result = await db.stream(query.execution_options(yield_per=chunk_size))
+        async for partition in result.scalars().partitions():
+            for transaction in partition:
+                yield transaction
+
+    @staticmethod
+    async def stream_export_rows(
+        db: AsyncSession,
+        user_id: Union[str, uuid.UUID],
+        filters: Optional[TransactionFilter] = None,
+        chunk_size: int = settings.TRANSACTIONS_STREAM_CHUNK_SIZE
+    ) -> AsyncIterator[Sequence[Row]]:
+        """
+        Yield chunks of plain export rows, with the category name joined in
+        SQL, from a server-side cursor
+        """
+        query = select(
+            Transaction.id,
+            Transaction.date,
+            Transaction.type,
+            Transaction.name,
+            Transaction.amount,
+            Transaction.category_id,
+            Category.name.label("category_name"),
+            Transaction.note,
+            Transaction.created_at,
+            Transaction.updated_at
+        ).outerjoin(Category, Category.id == Transaction.category_id)
+        query = TransactionService._apply_filters(query, user_id, filters)
+
+        result = await db.stream(query.execution_options(yield_per=chunk_size))
+        async for partition in result.partitions():
+            yield partition
+
+    @staticmethod
+    def _date_totals_query(criteria: List[ColumnElement]) -> Select:
+        """Income and expense totals per date with activity, newest first"""
+        is_income = Transaction.type == "income"
+        # The amount comes first in each CASE so the sums keep its Money type
+        return select(
+            Transaction.date,
+            func.sum(case((is_income, Transaction.amount), else_=0)),
+            func.sum(case((~is_income, Transaction.amount), else_=0))
+        ).where(*criteria).group_by(Transaction.date).order_by(Transaction.date.desc())
+
+    @staticmethod
+    async def get_grouped_transactions(
+        db: AsyncSession,
+        user_id: Union[str, uuid.UUID],
+        filters: Optional[TransactionFilter] = None,
+        days: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[TransactionsByDateResponse], Optional[str]]:
+        """
+        Get transactions grouped by date, newest date first.
+
+        Per-date totals come from one GROUP BY date query on the
+        (user_id, date) index. With days, only that many dates with activity
+        are returned, older than the cursor if given, together with the
+        cursor of the next page; the transactions are then fetched for
+        those dates only.
+        """
+        if filters is not None and filters.sort != "date_desc":
+            filters = filters.model_copy(update={"sort": "date_desc"})
+        criteria = TransactionService._filter_criteria(user_id, filters)
+
+        if cursor:
+            values = decode_cursor(cursor)
+            try:
+                (before,) = values
+                before = Date.fromisoformat(before)
+            except (TypeError, ValueError):
+                raise ValueError("Invalid cursor")
+            criteria.append(Transaction.date < before)
+
+        buckets_query = TransactionService._date_totals_query(criteria)
+        if days is not None:
+            buckets_query = buckets_query.limit(days + 1)
+        buckets = (await db.execute(buckets_query)).all()
+
+        next_cursor = None
+        if days is not None and len(buckets) > days:
+            buckets = buckets[:days]
+            next_cursor = encode_cursor([buckets[-1].date.isoformat()])
+        if not buckets:
+            return [], None
+
+        # The page's transactions: same filters, within its dates
+        transactions_query = TransactionService._apply_filters(
+            select(Transaction).options(joinedload(Transaction.category)), user_id, filters
+        ).where(Transaction.date >= buckets[-1].date, Transaction.date <= buckets[0].date)
+        by_date: Dict[Date, List[Transaction]] = {}
+        for transaction in (await db.execute(transactions_query)).scalars():
+            by_date.setdefault(transaction.date, []).append(transaction)
+
+        groups = [
+            TransactionsByDateResponse(
+                date=bucket_date,
+                transactions=by_date.get(bucket_date, []),
+                total_income=total_income or Decimal(0),
+                total_expense=total_expense or Decimal(0)
+            )
+            for bucket_date, total_income, total_expense in buckets
+        ]
+        return groups, next_cursor
+
+    @staticmethod
+    async def get_transaction_by_id(db: AsyncSession, user_id: Union[str, uuid.UUID], transaction_id: Union[str, uuid.UUID]) -> Optional[Transaction]:
         """Get a single transaction by ID"""
-        return db.query(Transaction).filter(
+        result = await db.execute(select(Transaction).options(
+            joinedload(Transaction.category)
+        ).where(
             Transaction.id == transaction_id,
             Transaction.user_id == user_id
-        ).first()
+        ))
+        return result.scalars().first()
 
     @staticmethod
-    def create_transaction(db: Session, user_id: Union[str, uuid.UUID], transaction_data: TransactionCreate) -> Transaction:
-        """Create a new transaction"""
-        # Verify category belongs to user
-        category = db.query(Category).filter(
-            Category.id == transaction_data.category_id,
-            Category.user_id == user_id
-        ).first()
-
-        if not category:
-            raise ValueError("Category not found or doesn't belong to user")
-
-        transaction_id = str(uuid.uuid4())
+    async def add_transaction(
+        db: AsyncSession,
+        user_id: Union[str, uuid.UUID],
+        transaction_data: TransactionCreate,
+        category: Category,
+        transaction_id: Optional[uuid.UUID] = None
+    ) -> Transaction:
+        """
+        Stage a new transaction in an already verified category, with its
+        monthly totals, without committing
+        """
         transaction = Transaction(
-            id=transaction_id,
+            id=transaction_id or uuid.uuid4(),
             user_id=user_id,
-            category_id=transaction_data.category_id,
+            category_id=category.id,
             type=transaction_data.type,
             name=transaction_data.name,
             amount=transaction_data.amount,
@@ -248,87 +656,455 @@ class TransactionService:
         )
 
         db.add(transaction)
-        db.commit()
-        db.refresh(transaction)
+        await MonthlyTotalsService.apply(
+            db, user_id, transaction.date, transaction.type, transaction.category_id,
+            transaction.amount, 1
+        )
         return transaction
 
     @staticmethod
-    def update_transaction(
-        db: Session,
+    async def create_transaction(db: AsyncSession, user_id: Union[str, uuid.UUID], transaction_data: TransactionCreate) -> Transaction:
+        """Create a new transaction"""
+        # Verify category belongs to user
+        result = await db.execute(select(Category).where(
+            Category.id == transaction_data.category_id,
+            Category.user_id == user_id
+        ))
+        category = result.scalars().first()
+
+        if not category:
+            raise ValueError("Category not found or doesn't belong to user")
+
+        transaction = await TransactionService.add_transaction(db, user_id, transaction_data, category)
+        await db.commit()
+        await bump_user_generation(str(user_id))
+        await db.refresh(transaction)
+        # Reuse the category verified above instead of lazy-loading it
+        transaction.category = category
+        return transaction
+
+    @staticmethod
+    async def bulk_create_transactions(
+        db: AsyncSession,
+        user_id: Union[str, uuid.UUID],
+        rows: List[dict],
+        batch_size: int = settings.BULK_IMPORT_BATCH_SIZE
+    ) -> Tuple[int, List[BulkImportError]]:
+        """
+        Validate and insert many transactions in one DB transaction.
+
+        Rows that fail validation or reference another user's category are
+        skipped and reported by index; the rest are inserted with
+        executemany in batches of batch_size. Returns the number of created
+        transactions and the per-row errors.
+        """
+        errors = []
+        valid = []
+        for index, row in enumerate(rows):
+            try:
+                transaction_data = TransactionCreate.model_validate(row)
+            except ValidationError as e:
+                errors.append(BulkImportError(index=index, error=format_validation_error(e)))
+                continue
+            # Already checked to be a UUID by the schema
+            valid.append((index, transaction_data, uuid.UUID(transaction_data.category_id)))
+
+        # Verify all referenced categories with a single IN query
+        requested_ids = {category_id for _, _, category_id in valid}
+        owned_ids = set()
+        if requested_ids:
+            result = await db.execute(select(Category.id).where(
+                Category.user_id == user_id,
+                Category.id.in_(requested_ids)
+            ))
+            owned_ids = {uuid.UUID(str(category_id)) for category_id in result.scalars().all()}
+
+        values = []
+        totals: Dict[tuple, List] = {}
+        for index, transaction_data, category_id in valid:
+            if category_id not in owned_ids:
+                errors.append(BulkImportError(
+                    index=index, error="Category not found or doesn't belong to user"
+                ))
+                continue
+            values.append({
+                "user_id": user_id,
+                "category_id": category_id,
+                "type": transaction_data.type,
+                "name": transaction_data.name,
+                "amount": transaction_data.amount,
+                "date": transaction_data.date,
+                "note": transaction_data.note,
+            })
+            bucket = totals.setdefault(
+                (transaction_data.date.replace(day=1), transaction_data.type, category_id), [Decimal(0), 0]
+            )
+            bucket[0] += transaction_data.amount
+            bucket[1] += 1
+
+        for start in range(0, len(values), batch_size):
+            await db.execute(insert(Transaction), values[start:start + batch_size])
+
+        for (month_start, transaction_type, category_id), (amount, count) in totals.items():
+            await MonthlyTotalsService.apply(
+                db, user_id, month_start, transaction_type, category_id, amount, count
+            )
+
+        await db.commit()
+        if values:
+            await bump_user_generation(str(user_id))
+        errors.sort(key=lambda error: error.index)
+        return len(values), errors
+
+    @staticmethod
+    async def change_transaction(
+        db: AsyncSession,
+        user_id: Union[str, uuid.UUID],
+        transaction: Transaction,
+        transaction_data: TransactionUpdate,
+        category: Category
+    ) -> None:
+        """
+        Stage an update of a transaction, moved to an already verified
+        category, and of its monthly totals, without committing
+        """
+        old_bucket = (transaction.date, transaction.category_id, transaction.amount)
+
+        update_data = transaction_data.dict(exclude_unset=True)
+        for field, value in update_data.items():
+            setattr(transaction, field, value)
+        transaction.category_id = category.id
+
+        # Move the amount between monthly totals if the bucket or amount changed
+        if (transaction.date, transaction.category_id, transaction.amount) != old_bucket:
+            old_date, old_category_id, old_amount = old_bucket
+            await MonthlyTotalsService.apply(
+                db, user_id, old_date, transaction.type, old_category_id, -old_amount, -1
+            )
+            await MonthlyTotalsService.apply(
+                db, user_id, transaction.date, transaction.type, transaction.category_id,
+                transaction.amount, 1
+            )
+
+        transaction.updated_at = datetime.utcnow()
+
+    @staticmethod
+    async def update_transaction(
+        db: AsyncSession,
         user_id: Union[str, uuid.UUID],
         transaction_id: Union[str, uuid.UUID],
         transaction_data: TransactionUpdate
     ) -> Optional[Transaction]:
         """Update a transaction"""
-        transaction = db.query(Transaction).filter(
-            Transaction.id == transaction_id,
-            Transaction.user_id == user_id
-        ).first()
+        transaction = await TransactionService.get_transaction_by_id(db, user_id, transaction_id)
 
         if not transaction:
             return None
 
         # Verify category if being updated
+        category = transaction.category
         if transaction_data.category_id:
-            category = db.query(Category).filter(
+            result = await db.execute(select(Category).where(
                 Category.id == transaction_data.category_id,
                 Category.user_id == user_id
-            ).first()
+            ))
+            category = result.scalars().first()
             if not category:
                 raise ValueError("Category not found or doesn't belong to user")
 
-        update_data = transaction_data.dict(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(transaction, field, value)
-
-        transaction.updated_at = datetime.utcnow()
-        db.commit()
-        db.refresh(transaction)
+        await TransactionService.change_transaction(db, user_id, transaction, transaction_data, category)
+        await db.commit()
+        await bump_user_generation(str(user_id))
+        await db.refresh(transaction)
+        transaction.category = category
         return transaction
 
     @staticmethod
-    def delete_transaction(db: Session, user_id: Union[str, uuid.UUID], transaction_id: Union[str, uuid.UUID]) -> bool:
+    async def remove_transaction(db: AsyncSession, user_id: Union[str, uuid.UUID], transaction: Transaction) -> None:
+        """
+        Stage deleting a transaction, with its monthly totals and a tombstone
+        for sync, without committing
+        """
+        await db.delete(transaction)
+        db.add(Tombstone(user_id=user_id, entity="transaction", entity_id=transaction.id))
+        await MonthlyTotalsService.apply(
+            db, user_id, transaction.date, transaction.type, transaction.category_id,
+            -transaction.amount, -1
+        )
+
+    @staticmethod
+    async def delete_transaction(db: AsyncSession, user_id: Union[str, uuid.UUID], transaction_id: Union[str, uuid.UUID]) -> bool:
         """Delete a transaction"""
-        transaction = db.query(Transaction).filter(
+        result = await db.execute(select(Transaction).where(
             Transaction.id == transaction_id,
             Transaction.user_id == user_id
-        ).first()
+        ))
+        transaction = result.scalars().first()
 
         if not transaction:
             return False
 
-        db.delete(transaction)
-        db.commit()
+        await TransactionService.remove_transaction(db, user_id, transaction)
+        await db.commit()
+        await bump_user_generation(str(user_id))
         return True
 
 
+@instrument_service
+class MonthlyTotalsService:
+    """Maintenance of the monthly_category_totals rollup"""
+
+    # Dialect-specific INSERT supporting ON CONFLICT upserts
+    _upsert_inserts = {
+        "postgresql": postgresql_insert,
+        "sqlite": sqlite_insert,
+    }
+
+    @staticmethod
+    async def apply(
+        db: AsyncSession,
+        user_id: Union[str, uuid.UUID],
+        transaction_date: Date,
+        transaction_type: str,
+        category_id: Optional[Union[str, uuid.UUID]],
+        amount: Decimal,
+        count: int
+    ) -> None:
+        """
+        Add amount and count to the bucket of a transaction, creating the
+        bucket if needed. Runs in the caller's transaction and does not commit.
+        """
+        upsert = MonthlyTotalsService._upsert_inserts[db.bind.dialect.name]
+        statement = upsert(MonthlyCategoryTotal).values(
+            id=uuid.uuid4(),
+            user_id=user_id,
+            year=transaction_date.year,
+            month=transaction_date.month,
+            type=transaction_type,
+            category_id=category_id,
+            total=amount,
+            count=count
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=["user_id", "year", "month", "type", "category_id"],
+            # excluded and set_ use column names; total is stored as total_cents
+            set_={
+                "total_cents": MonthlyCategoryTotal.total + statement.excluded.total_cents,
+                "count": MonthlyCategoryTotal.count + statement.excluded.count,
+            }
+        )
+        await db.execute(statement)
+
+    @staticmethod
+    async def _totals_from_transactions(
+        db: AsyncSession,
+        user_id: Optional[Union[str, uuid.UUID]] = None
+    ) -> Dict[tuple, Tuple[Decimal, int]]:
+        """Totals per bucket recomputed from the transactions table"""
+        year = extract("year", Transaction.date)
+        month = extract("month", Transaction.date)
+        query = select(
+            Transaction.user_id,
+            year,
+            month,
+            Transaction.type,
+            Transaction.category_id,
+            func.sum(Transaction.amount),
+            func.count()
+        ).group_by(Transaction.user_id, year, month, Transaction.type, Transaction.category_id)
+        if user_id is not None:
+            query = query.where(Transaction.user_id == user_id)
+
+        result = await db.execute(query)
+        return {
+            (row_user_id, int(row_year), int(row_month), row_type, category_id): (total, count)
+            for row_user_id, row_year, row_month, row_type, category_id, total, count in result.all()
+        }
+
+    @staticmethod
+    async def rebuild(db: AsyncSession, user_id: Optional[Union[str, uuid.UUID]] = None) -> int:
+        """
+        Recompute the rollup from transactions, for one user or everyone.
+        Returns the number of buckets written.
+        """
+        totals = await MonthlyTotalsService._totals_from_transactions(db, user_id)
+
+        query = delete(MonthlyCategoryTotal)
+        if user_id is not None:
+            query = query.where(MonthlyCategoryTotal.user_id == user_id)
+        await db.execute(query)
+
+        if totals:
+            await db.execute(insert(MonthlyCategoryTotal), [
+                {
+                    "id": uuid.uuid4(),
+                    "user_id": bucket_user_id,
+                    "year": year,
+                    "month": month,
+                    "type": bucket_type,
+                    "category_id": category_id,
+                    "total": total,
+                    "count": count,
+                }
+                for (bucket_user_id, year, month, bucket_type, category_id), (total, count) in totals.items()
+            ])
+        await db.commit()
+        return len(totals)
+
+    @staticmethod
+    async def verify(
+        db: AsyncSession,
+        user_id: Optional[Union[str, uuid.UUID]] = None
+    ) -> List[Tuple[tuple, Tuple[Decimal, int], Tuple[Decimal, int]]]:
+        """
+        Compare the rollup with the transactions table. Returns
+        (bucket, expected, actual) for every bucket that has drifted.
+        """
+        expected = await MonthlyTotalsService._totals_from_transactions(db, user_id)
+
+        query = select(
+            MonthlyCategoryTotal.user_id,
+            MonthlyCategoryTotal.year,
+            MonthlyCategoryTotal.month,
+            MonthlyCategoryTotal.type,
+            MonthlyCategoryTotal.category_id,
+            func.sum(MonthlyCategoryTotal.total),
+            func.sum(MonthlyCategoryTotal.count)
+        ).group_by(
+            MonthlyCategoryTotal.user_id,
+            MonthlyCategoryTotal.year,
+            MonthlyCategoryTotal.month,
+            MonthlyCategoryTotal.type,
+            MonthlyCategoryTotal.category_id
+        ).having(func.sum(MonthlyCategoryTotal.count) != 0)
+        if user_id is not None:
+            query = query.where(MonthlyCategoryTotal.user_id == user_id)
+
+        result = await db.execute(query)
+        actual = {tuple(row[:5]): (row[5], row[6]) for row in result.all()}
+
+        drift = []
+        for bucket in expected.keys() | actual.keys():
+            # Totals are exact, so any difference is drift
+            expected_bucket = expected.get(bucket, (0, 0))
+            actual_bucket = actual.get(bucket, (0, 0))
+            if expected_bucket != actual_bucket:
+                drift.append((bucket, expected_bucket, actual_bucket))
+        return drift
+
+
+@instrument_service
 class SummaryService:
     """Summary and analytics service"""
 
     @staticmethod
-    def get_monthly_summary(
-        db: Session,
+    def _category_totals_query(
+        user_id: Union[str, uuid.UUID],
+        start: Tuple[int, int],
+        end: Tuple[int, int]
+    ) -> Select:
+        """
+        Totals per (year, month, type, category) from start through end
+        (year, month), inclusive, read from the monthly rollup
+        """
+        group_columns = [
+            MonthlyCategoryTotal.year,
+            MonthlyCategoryTotal.month,
+            MonthlyCategoryTotal.type,
+            MonthlyCategoryTotal.category_id,
+            Category.name.label("category_name"),
+            Category.icon.label("category_icon"),
+            Category.color.label("category_color")
+        ]
+        month = tuple_(MonthlyCategoryTotal.year, MonthlyCategoryTotal.month)
+
+        return (
+            select(*group_columns, func.sum(MonthlyCategoryTotal.total).label("total"))
+            .outerjoin(Category, Category.id == MonthlyCategoryTotal.category_id)
+            .where(
+                MonthlyCategoryTotal.user_id == user_id,
+                month >= tuple_(*start),
+                month <= tuple_(*end)
+            )
+            .group_by(*group_columns)
+            .having(func.sum(MonthlyCategoryTotal.count) > 0)
+        )
+
+    @staticmethod
+    async def get_monthly_summary(
+        db: AsyncSession,
         user_id: Union[str, uuid.UUID],
         month: int,
         year: int
     ) -> BalanceSummaryResponse:
         """Get monthly balance summary"""
-        # Get all transactions for the month
-        transactions = TransactionService.get_user_transactions(
-            db, user_id, month, year
-        )
+        result = await db.execute(SummaryService._category_totals_query(
+            user_id, (year, month), (year, month)
+        ))
+        return SummaryService._build_summary(user_id, month, year, result.all())
+
+    @staticmethod
+    async def get_summary_history(
+        db: AsyncSession,
+        user_id: Union[str, uuid.UUID],
+        start_month: int,
+        start_year: int,
+        end_month: int,
+        end_year: int
+    ) -> List[BalanceSummaryResponse]:
+        """
+        Get one summary per month from start through end month, inclusive,
+        using a single aggregated query. Months without transactions are
+        returned with zero totals.
+        """
+        if (start_year, start_month) > (end_year, end_month):
+            raise ValueError("Start month must not be after end month")
+
+        months = []
+        year, month = start_year, start_month
+        while (year, month) <= (end_year, end_month):
+            months.append((year, month))
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+        if len(months) > settings.SUMMARY_HISTORY_MAX_MONTHS:
+            raise ValueError(
+                f"Summary history is limited to {settings.SUMMARY_HISTORY_MAX_MONTHS} months"
+            )
+
+        result = await db.execute(SummaryService._category_totals_query(
+            user_id, (start_year, start_month), (end_year, end_month)
+        ))
+
+        rows_by_month = {}
+        for row in result.all():
+            rows_by_month.setdefault((row.year, row.month), []).append(row)
+
+        return [
+            SummaryService._build_summary(
+                user_id, month, year, rows_by_month.get((year, month), [])
+            )
+            for year, month in months
+        ]
 
+    @staticmethod
+    def _build_summary(
+        user_id: Union[str, uuid.UUID],
+        month: int,
+        year: int,
+        rows: Sequence[Row]
+    ) -> BalanceSummaryResponse:
+        """Build a monthly summary from per-category totals"""
         # Calculate totals
-        total_income = sum(t.amount for t in transactions if t.type == "income")
-        total_expense = sum(t.amount for t in transactions if t.type == "expense")
+        total_income = sum((row.total for row in rows if row.type == "income"), Decimal(0))
+        total_expense = sum((row.total for row in rows if row.type == "expense"), Decimal(0))
         balance = total_income - total_expense
 
         # Calculate category breakdowns
         income_by_category = SummaryService._calculate_category_breakdown(
-            transactions, "income", total_income
+            rows, "income", total_income
         )
         expense_by_category = SummaryService._calculate_category_breakdown(
-            transactions, "expense", total_expense
+            rows, "expense", total_expense
         )
 
         return BalanceSummaryResponse(
@@ -344,41 +1120,252 @@ class SummaryService:
 
     @staticmethod
     def _calculate_category_breakdown(
-        transactions: List[Transaction],
+        rows: Sequence[Row],
         transaction_type: str,
-        total_amount: float
+        total_amount: Decimal
     ) -> Optional[List[CategorySummary]]:
-        """Calculate breakdown by category"""
+        """Calculate breakdown by category from per-category totals"""
         if total_amount == 0:
             return None
 
-        # Group by category
-        category_totals = {}
-        for transaction in transactions:
-            if transaction.type == transaction_type:
-                cat_id = transaction.category_id
-                if cat_id not in category_totals:
-                    category_totals[cat_id] = {
-                        'total': 0,
-                        'category': transaction.category
-                    }
-                category_totals[cat_id]['total'] += transaction.amount
-
-        # Convert to CategorySummary
         result = []
-        for cat_data in category_totals.values():
-            total = cat_data['total']
-            category = cat_data['category']
-            if category:
+        for row in rows:
+            # Transactions whose category no longer exists only count towards totals
+            if row.type == transaction_type and row.category_name is not None:
                 result.append(CategorySummary(
-                    category_id=str(category.id),
-                    category_name=category.name,
-                    category_icon=category.icon,
-                    category_color=category.color,
-                    total=total,
-                    percentage=(total / total_amount) * 100
+                    category_id=str(row.category_id),
+                    category_name=row.category_name,
+                    category_icon=row.category_icon,
+                    category_color=row.category_color,
+                    total=row.total,
+                    percentage=float(row.total * 100 / total_amount)
                 ))
 
         # Sort by total descending
         result.sort(key=lambda x: x.total, reverse=True)
-        return result
\ No newline at end of file
+        return result
+
+
+@instrument_service
+class SyncService:
+    """Delta sync for offline-first clients"""
+
+    @staticmethod
+    def encode_token(moment: datetime) -> str:
+        """Opaque sync token for a point in time"""
+        return encode_cursor([moment.isoformat()])
+
+    @staticmethod
+    def decode_token(token: str) -> datetime:
+        """Point in time of a token from encode_token"""
+        try:
+            (moment,) = decode_cursor(token)
+            return datetime.fromisoformat(moment)
+        except (TypeError, ValueError):
+            raise ValueError("Invalid sync token")
+
+    @staticmethod
+    async def get_changes(
+        db: AsyncSession,
+        user_id: Union[str, uuid.UUID],
+        since: Optional[datetime] = None
+    ) -> dict:
+        """
+        Categories and transactions created or updated after `since`, and
+        ids deleted after it. Without `since`, or when it is older than the
+        tombstone retention, everything is returned as a full sync and the
+        client should replace its local data.
+
+        The next token is taken before reading and moved back by
+        SYNC_OVERLAP_SECONDS, so a change may be sent twice but never
+        skipped; clients apply changes as upserts.
+        """
+        now = datetime.utcnow()
+        retention_start = now - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+        full_sync = since is None or since < retention_start
+
+        category_query = select(Category).where(Category.user_id == user_id)
+        # No ordering, so the updated_at index can drive the scan
+        transaction_query = TransactionService._plain_query(user_id).order_by(None)
+        deleted = {"category": [], "transaction": []}
+
+        if not full_sync:
+            category_query = category_query.where(Category.updated_at > since)
+            transaction_query = transaction_query.where(Transaction.updated_at > since)
+
+            result = await db.execute(
+                select(Tombstone.entity, Tombstone.entity_id).where(
+                    Tombstone.user_id == user_id,
+                    Tombstone.deleted_at > since
+                )
+            )
+            for entity, entity_id in result.all():
+                deleted[entity].append(str(entity_id))
+
+        categories = (await db.execute(category_query)).scalars().all()
+        transactions = (await db.execute(transaction_query)).all()
+
+        return {
+            "categories": categories,
+            "transactions": transactions,
+            "deleted": {"categories": deleted["category"], "transactions": deleted["transaction"]},
+            "next_token": SyncService.encode_token(now - timedelta(seconds=settings.SYNC_OVERLAP_SECONDS)),
+            "full_sync": full_sync,
+        }
+
+    @staticmethod
+    async def prune_tombstones(db: AsyncSession, before: Optional[datetime] = None) -> int:
+        """Delete tombstones older than the retention period; returns how many"""
+        if before is None:
+            before = datetime.utcnow() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+        result = await db.execute(delete(Tombstone).where(Tombstone.deleted_at < before))
+        await db.commit()
+        return result.rowcount
+
+
+@instrument_service
+class BatchService:
+    """Many category and transaction writes in one round trip and one DB transaction"""
+
+    @staticmethod
+    def _parse_id(value: Any) -> uuid.UUID:
+        try:
+            return uuid.UUID(str(value))
+        except ValueError:
+            raise ValueError("Invalid id")
+
+    @staticmethod
+    def _owned(lookup: Dict[uuid.UUID, Any], value: Any, user_id: Union[str, uuid.UUID], label: str):
+        """Row from a prefetched lookup, if it exists and belongs to the user"""
+        row = lookup.get(BatchService._parse_id(value)) if value else None
+        if row is None or str(row.user_id) != str(user_id):
+            raise ValueError(f"{label} not found or doesn't belong to user")
+        return row
+
+    @staticmethod
+    def _new_id(lookup: Dict[uuid.UUID, Any], value: Any, label: str) -> Optional[uuid.UUID]:
+        """Client-generated id for a create, checked against the prefetched rows"""
+        if not value:
+            return None
+        new_id = BatchService._parse_id(value)
+        if new_id in lookup:
+            raise ValueError(f"{label} already exists")
+        return new_id
+
+    @staticmethod
+    async def apply(
+        db: AsyncSession,
+        user_id: Union[str, uuid.UUID],
+        operations: List[BatchOperation],
+        atomic: bool = False
+    ) -> Tuple[List[BatchResult], int]:
+        """
+        Apply operations in order and commit once.
+
+        Every category and transaction the batch mentions is loaded up front
+        with one IN query each, and later operations see the effect of
+        earlier ones (a category created by id can be used right away).
+        Failed operations are reported and skipped; with atomic=True any
+        failure rolls back the whole batch. Returns the per-operation results
+        and the number of operations applied.
+        """
+        category_ids, transaction_ids = set(), set()
+        for operation in operations:
+            ids = category_ids if operation.entity == "category" else transaction_ids
+            for value, target in ((operation.id, ids), ((operation.data or {}).get("categoryId"), category_ids)):
+                try:
+                    target.add(uuid.UUID(str(value)))
+                except ValueError:
+                    pass  # missing or malformed, reported by the operation itself
+
+        # Unscoped by user so that client-generated ids can be checked for
+        # collisions; ownership is checked per operation
+        transactions: Dict[uuid.UUID, Transaction] = {}
+        if transaction_ids:
+            result = await db.execute(
+                select(Transaction).where(Transaction.id.in_(transaction_ids))
+            )
+            transactions = {transaction.id: transaction for transaction in result.scalars().all()}
+            category_ids.update(transaction.category_id for transaction in transactions.values())
+
+        categories: Dict[uuid.UUID, Category] = {}
+        if category_ids:
+            result = await db.execute(select(Category).where(Category.id.in_(category_ids)))
+            categories = {category.id: category for category in result.scalars().all()}
+
+        results = []
+        for index, operation in enumerate(operations):
+            try:
+                entity_id = await BatchService._apply_one(
+                    db, user_id, operation, categories, transactions
+                )
+            except ValidationError as e:
+                results.append(BatchResult(index=index, ok=False, error=format_validation_error(e)))
+            except ValueError as e:
+                results.append(BatchResult(index=index, ok=False, error=str(e)))
+            else:
+                results.append(BatchResult(index=index, ok=True, id=str(entity_id)))
+
+        applied = sum(result.ok for result in results)
+        if atomic and applied < len(results):
+            await db.rollback()
+            for result in results:
+                if result.ok:
+                    result.ok, result.id, result.error = False, None, "Rolled back: another operation failed"
+            return results, 0
+
+        if applied:
+            await db.commit()
+            await bump_user_generation(str(user_id))
+        return results, applied
+
+    @staticmethod
+    async def _apply_one(
+        db: AsyncSession,
+        user_id: Union[str, uuid.UUID],
+        operation: BatchOperation,
+        categories: Dict[uuid.UUID, Category],
+        transactions: Dict[uuid.UUID, Transaction]
+    ) -> uuid.UUID:
+        """Stage one operation; raises ValueError before changing anything if it is invalid"""
+        if operation.entity == "category":
+            if operation.op == "create":
+                category_data = CategoryCreate.model_validate(operation.data or {})
+                category_id = BatchService._new_id(categories, operation.id, "Category")
+                category = CategoryService.add_category(db, user_id, category_data, category_id)
+                # Insert now: monthly totals of later transactions reference it
+                await db.flush()
+                categories[category.id] = category
+                return category.id
+
+            if operation.op == "delete":
+                category = BatchService._owned(categories, operation.id, user_id, "Category")
+                await CategoryService.remove_category(db, user_id, category)
+                del categories[category.id]
+                return category.id
+
+            raise ValueError("Categories cannot be updated")
+
+        if operation.op == "create":
+            transaction_data = TransactionCreate.model_validate(operation.data or {})
+            category = BatchService._owned(categories, transaction_data.category_id, user_id, "Category")
+            transaction_id = BatchService._new_id(transactions, operation.id, "Transaction")
+            transaction = await TransactionService.add_transaction(
+                db, user_id, transaction_data, category, transaction_id
+            )
+            transactions[transaction.id] = transaction
+            return transaction.id
+
+        transaction = BatchService._owned(transactions, operation.id, user_id, "Transaction")
+
+        if operation.op == "update":
+            transaction_data = TransactionUpdate.model_validate(operation.data or {})
+            category = BatchService._owned(
+                categories, transaction_data.category_id or transaction.category_id, user_id, "Category"
+            )
+            await TransactionService.change_transaction(db, user_id, transaction, transaction_data, category)
+            return transaction.id
+
+        await TransactionService.remove_transaction(db, user_id, transaction)
+        del transactions[transaction.id]
+        return transaction.id
@@ -0,0 +1,151 @@
+"""
+Incremental encoders for transaction exports
+
+Each encoder turns an async iterator of row chunks into an async iterator
+of bytes, so an export never holds more than one chunk in memory.
+"""
+import csv
+import io
+import json
+from datetime import date
+from typing import AsyncIterator, List, Sequence
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency, only needed for parquet exports
+    pa = None
+
+PARQUET_AVAILABLE = pa is not None
+
+# Export columns, named like the API's JSON fields
+EXPORT_COLUMNS = [
+    ("id", "id"),
+    ("date", "date"),
+    ("type", "type"),
+    ("name", "name"),
+    ("amount", "amount"),
+    ("category_id", "categoryId"),
+    ("category_name", "categoryName"),
+    ("note", "note"),
+    ("created_at", "created_at"),
+    ("updated_at", "updated_at"),
+]
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def _row_values(row) -> List:
+    values = []
+    for field, _ in EXPORT_COLUMNS:
+        value = getattr(row, field)
+        if field in ("id", "category_id") and value is not None:
+            value = str(value)
+        elif field == "amount":
+            # Same number as the API's JSON
+            value = float(value)
+        values.append(value)
+    return values
+
+
+async def csv_chunks(partitions: AsyncIterator[Sequence]) -> AsyncIterator[bytes]:
+    """CSV with a header row"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([name for _, name in EXPORT_COLUMNS])
+    async for rows in partitions:
+        for row in rows:
+            writer.writerow([
+                value.isoformat() if isinstance(value, date) else value
+                for value in _row_values(row)
+            ])
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def _json_default(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+async def ndjson_chunks(partitions: AsyncIterator[Sequence]) -> AsyncIterator[bytes]:
+    """One JSON object per line"""
+    names = [name for _, name in EXPORT_COLUMNS]
+    async for rows in partitions:
+        yield "".join(
+            json.dumps(dict(zip(names, _row_values(row))), default=_json_default) + "\n"
+            for row in rows
+        ).encode()
+
+
+class _ChunkSink:
+    """Write-only file that hands out what was written since the last take()"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+async def parquet_chunks(partitions: AsyncIterator[Sequence]) -> AsyncIterator[bytes]:
+    """Parquet, one row group per chunk"""
+    if pa is None:
+        raise RuntimeError("The pyarrow package is required for parquet exports")
+    schema = pa.schema([
+        ("id", pa.string()),
+        ("date", pa.date32()),
+        ("type", pa.string()),
+        ("name", pa.string()),
+        ("amount", pa.float64()),
+        ("categoryId", pa.string()),
+        ("categoryName", pa.string()),
+        ("note", pa.string()),
+        ("created_at", pa.timestamp("us")),
+        ("updated_at", pa.timestamp("us")),
+    ])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    async for rows in partitions:
+        columns = list(zip(*(_row_values(row) for row in rows)))
+        writer.write_table(pa.Table.from_arrays(
+            [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+            schema=schema
+        ))
+        yield sink.take()
+    writer.close()
+    yield sink.take()
+
+
+EXPORT_ENCODERS = {
+    "csv": csv_chunks,
+    "ndjson": ndjson_chunks,
+    "parquet": parquet_chunks,
+}
@@ -0,0 +1,83 @@
+"""
+Serialization of plain transaction rows straight to JSON bytes
+
+Builds dicts with the same keys, order and values as the Transaction and
+Category schemas and encodes them the way FastAPI's JSONResponse does, so
+the output is byte-for-byte what a TransactionsListResponse response_model
+would render, without constructing a model per row.
+"""
+import json
+import uuid
+from datetime import date
+from typing import Any, Optional, Sequence
+
+from app.schemas.schemas import Category as CategorySchema
+
+
+def _default(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def transaction_row_to_dict(row) -> dict:
+    """A TransactionService._plain_query row as the Transaction schema dumps it"""
+    category = None
+    if row.category_ref is not None:
+        category = {
+            "name": row.category_name,
+            "icon": row.category_icon,
+            "color": row.category_color,
+            "id": row.category_ref,
+            "userId": row.category_user_id,
+            "created_at": row.category_created_at,
+            "updated_at": row.category_updated_at,
+        }
+    return {
+        "type": row.type,
+        "name": row.name,
+        "categoryId": row.category_id,
+        "amount": float(row.amount),
+        "date": row.date,
+        "note": row.note,
+        "id": row.id,
+        "userId": row.user_id,
+        "category": category,
+        "created_at": row.created_at,
+        "updated_at": row.updated_at,
+    }
+
+
+def render_json(content: Any) -> bytes:
+    """Encode like FastAPI's JSONResponse, also accepting dates and UUIDs"""
+    return json.dumps(
+        content,
+        default=_default,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":")
+    ).encode("utf-8")
+
+
+def render_transactions_list(rows: Sequence, next_cursor: Optional[str] = None) -> bytes:
+    """TransactionsListResponse JSON for plain transaction rows"""
+    return render_json({
+        "transactions": [transaction_row_to_dict(row) for row in rows],
+        "nextCursor": next_cursor,
+    })
+
+
+def render_sync(changes: dict) -> bytes:
+    """SyncResponse JSON for SyncService.get_changes"""
+    return render_json({
+        "categories": [
+            CategorySchema.model_validate(category).model_dump(mode="json", by_alias=True)
+            for category in changes["categories"]
+        ],
+        "transactions": [transaction_row_to_dict(row) for row in changes["transactions"]],
+        "deleted": changes["deleted"],
+        "nextToken": changes["next_token"],
+        "fullSync": changes["full_sync"],
+    })
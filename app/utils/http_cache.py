@@ -0,0 +1,106 @@
+"""
+ETags, conditional GETs and cached JSON responses
+"""
+import hashlib
+from typing import Any, Awaitable, Callable, Dict, Optional
+from urllib.parse import urlencode
+
+from fastapi import Request, Response, status
+from pydantic import BaseModel
+
+from app.core.cache import RESPONSE_CACHE_ENABLED, get_user_generation, response_cache
+
+# Clients may keep responses but must revalidate them before use
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag from the response body"""
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def version_etag(*parts) -> str:
+    """
+    Weak ETag from a cheap version of the data (row counts, latest
+    updated_at, query string), computed without rendering the body
+    """
+    digest = hashlib.blake2b("|".join(map(str, parts)).encode(), digest_size=16).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Whether If-None-Match lists the ETag. Uses weak comparison, as GET
+    conditionals do, so W/ prefixes are ignored on both sides.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in header.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 response"""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    )
+
+
+def conditional_get(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """
+    Set the ETag on the response being built, and return a 304 instead if
+    the client already has this version
+    """
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return None
+
+
+def json_response(request: Request, body: bytes, etag: Optional[str] = None) -> Response:
+    """JSON response with an ETag, or a 304 when the client already has it"""
+    etag = etag or make_etag(body)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    )
+
+
+async def cached_json_response(
+    request: Request,
+    user_id: str,
+    endpoint: str,
+    params: Dict[str, Any],
+    build: Callable[[], Awaitable[BaseModel]]
+) -> Response:
+    """
+    Serve a per-user read from the response cache.
+
+    Entries are keyed by the user's current data generation, so writes that
+    bump the generation invalidate every cached read of that user at once.
+    On a miss, build() runs and its JSON (by alias, as FastAPI would render
+    it) is stored as bytes. Without RESPONSE_CACHE_ENABLED, build() runs on
+    every request.
+    """
+    if not RESPONSE_CACHE_ENABLED:
+        model = await build()
+        return json_response(request, model.model_dump_json(by_alias=True).encode())
+
+    generation = await get_user_generation(user_id)
+    query = urlencode(sorted((name, value) for name, value in params.items() if value is not None), doseq=True)
+    key = f"{user_id}:{generation}:{endpoint}?{query}"
+
+    body = await response_cache.get(key)
+    if body is None:
+        model = await build()
+        body = model.model_dump_json(by_alias=True).encode()
+        await response_cache.set(key, body)
+    return json_response(request, body)
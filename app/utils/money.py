@@ -0,0 +1,41 @@
+"""
+Exact money amounts
+
+Amounts are stored as integers of minor units (cents) and handled as
+Decimal in Python, so no total or comparison ever goes through a float.
+"""
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from typing import Union
+
+# Digits after the decimal point: one unit is 10 ** MONEY_SCALE cents
+MONEY_SCALE = 2
+
+CENT = Decimal(1).scaleb(-MONEY_SCALE)
+
+
+def parse_amount(value: Union[Decimal, int, float, str]) -> Decimal:
+    """
+    Decimal from an amount. Floats go through their repr, so 0.1 is
+    Decimal("0.1") rather than its binary expansion.
+    """
+    if isinstance(value, Decimal):
+        return value
+    if isinstance(value, bool):
+        raise TypeError("Amount must be a number")
+    try:
+        amount = Decimal(str(value)) if isinstance(value, float) else Decimal(value)
+    except InvalidOperation:
+        raise ValueError(f"Invalid amount: {value!r}")
+    if not amount.is_finite():
+        raise ValueError(f"Invalid amount: {value!r}")
+    return amount
+
+
+def to_cents(value: Union[Decimal, int, float, str]) -> int:
+    """Integer minor units of an amount; sub-cent digits are rounded half up"""
+    return int(parse_amount(value).quantize(CENT, rounding=ROUND_HALF_UP).scaleb(MONEY_SCALE))
+
+
+def from_cents(cents: int) -> Decimal:
+    """Amount of an integer of minor units, with MONEY_SCALE places"""
+    return Decimal(cents).scaleb(-MONEY_SCALE)
@@ -0,0 +1,29 @@
+"""
+Opaque cursors for keyset pagination
+"""
+import base64
+import json
+from typing import Any, List
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """
+    Encode the sort key of the last row of a page as an opaque cursor
+    """
+    raw = json.dumps(values, default=str, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """
+    Decode a cursor produced by encode_cursor
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+    return values
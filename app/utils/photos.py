@@ -0,0 +1,166 @@
+"""
+Profile photo storage
+
+Uploads are copied to disk in chunks without blocking the event loop and
+hashed on the way. The image is then checked and resized in a thread pool,
+and every file is named after the content hash, so a URL never changes
+meaning and can be cached as immutable. The previous photo is removed only
+once the new URL is committed.
+"""
+import asyncio
+import hashlib
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import AsyncIterator, Optional, Tuple
+
+import anyio
+from fastapi.staticfiles import StaticFiles
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from app.core.config import settings
+
+# Pillow format -> stored file extension
+PHOTO_FORMATS = {"JPEG": ".jpg", "PNG": ".png", "GIF": ".gif", "WEBP": ".webp"}
+
+# Hex digits of the SHA-256 kept in file names
+HASH_LENGTH = 16
+
+# Content-hashed files never change, so clients may keep them for a year
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Uploads still being written (left alone when old photos are removed)
+TEMP_PREFIX = ".upload-"
+
+# Multipart boundaries and part headers on top of the photo itself
+FORM_OVERHEAD_BYTES = 16 * 1024
+
+photo_resize_executor = ThreadPoolExecutor(
+    max_workers=settings.PHOTO_RESIZE_WORKERS,
+    thread_name_prefix="photo-resize"
+)
+
+
+class PhotoTooLarge(ValueError):
+    """Raised when an upload exceeds PHOTO_MAX_BYTES"""
+
+    def __init__(self):
+        super().__init__(f"Photo must be at most {settings.PHOTO_MAX_BYTES // 1024} KiB")
+
+
+async def limit_body(stream: AsyncIterator[bytes], max_bytes: int) -> AsyncIterator[bytes]:
+    """Pass a request body through, failing as soon as it exceeds max_bytes"""
+    received = 0
+    async for chunk in stream:
+        received += len(chunk)
+        if received > max_bytes:
+            raise PhotoTooLarge()
+        yield chunk
+
+
+async def save_upload(upload, directory: Path) -> Tuple[Path, str]:
+    """
+    Copy an UploadFile to a temporary file in directory, chunk by chunk.
+    Returns the temporary path and the content hash.
+    """
+    await anyio.Path(directory).mkdir(parents=True, exist_ok=True)
+    temp_path = directory / f"{TEMP_PREFIX}{uuid.uuid4().hex}"
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        async with await anyio.open_file(temp_path, "wb") as file:
+            while chunk := await upload.read(settings.PHOTO_UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > settings.PHOTO_MAX_BYTES:
+                    raise PhotoTooLarge()
+                digest.update(chunk)
+                await file.write(chunk)
+    except BaseException:
+        await anyio.Path(temp_path).unlink(missing_ok=True)
+        raise
+    return temp_path, digest.hexdigest()[:HASH_LENGTH]
+
+
+def variant_name(content_hash: str, extension: str, size: int) -> str:
+    """File name of a resized variant"""
+    return f"{content_hash}_{size}{extension}"
+
+
+def photo_url(user_id: str, filename: str) -> str:
+    """Public URL of a stored photo"""
+    return f"{settings.PHOTO_BASE_URL}/uploads/{user_id}/{filename}"
+
+
+def stored_filename(url: Optional[str], user_id: str) -> Optional[str]:
+    """Name of the stored photo a photo_url points at, if it is one of ours"""
+    prefix = photo_url(user_id, "")
+    if not url or not url.startswith(prefix):
+        return None
+    filename = url[len(prefix):]
+    if not filename or "/" in filename or filename.startswith("."):
+        return None
+    return filename
+
+
+def store_photo(temp_path: Path, directory: Path, content_hash: str) -> str:
+    """
+    Check the image, write its resized variants and move the original into
+    place under its content hash. Blocking: runs in photo_resize_executor.
+    Returns the original's name.
+    """
+    try:
+        try:
+            with Image.open(temp_path) as image:
+                image_format = image.format
+                image.verify()
+        except (UnidentifiedImageError, OSError, SyntaxError):
+            raise ValueError("File must be an image")
+        extension = PHOTO_FORMATS.get(image_format)
+        if extension is None:
+            raise ValueError(f"Unsupported image format: {image_format}")
+
+        # verify() leaves the image unusable, so decode it again
+        with Image.open(temp_path) as image:
+            image = ImageOps.exif_transpose(image)
+            if image_format == "JPEG" and image.mode not in ("RGB", "L"):
+                image = image.convert("RGB")
+            for size in settings.PHOTO_VARIANT_SIZES:
+                variant = image.copy()
+                variant.thumbnail((size, size), Image.Resampling.LANCZOS)
+                variant.save(directory / variant_name(content_hash, extension, size), format=image_format)
+
+        filename = f"{content_hash}{extension}"
+        os.replace(temp_path, directory / filename)
+    finally:
+        temp_path.unlink(missing_ok=True)
+    return filename
+
+
+def remove_photo(directory: Path, filename: str) -> None:
+    """Delete a stored photo and its variants. Blocking."""
+    stem, extension = os.path.splitext(filename)
+    (directory / filename).unlink(missing_ok=True)
+    for size in settings.PHOTO_VARIANT_SIZES:
+        (directory / variant_name(stem, extension, size)).unlink(missing_ok=True)
+
+
+async def store_photo_async(temp_path: Path, directory: Path, content_hash: str) -> str:
+    """Run store_photo in the resize pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(photo_resize_executor, store_photo, temp_path, directory, content_hash)
+
+
+async def remove_photo_async(directory: Path, filename: str) -> None:
+    """Run remove_photo in the resize pool"""
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(photo_resize_executor, remove_photo, directory, filename)
+
+
+class ImmutableStaticFiles(StaticFiles):
+    """Static files served with a long-lived, immutable Cache-Control"""
+
+    def file_response(self, *args, **kwargs):
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        return response
@@ -0,0 +1,59 @@
+"""
+Bulk import vs one POST /transactions per row
+
+Inserts the same rows once through individual POST /transactions calls and
+once through a single POST /transactions/bulk, and reports rows per second
+for each.
+
+Usage:
+    python -m benchmarks.bulk_import [--rows 2000]
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.common import build_app, client_for, configure_database, seed_user
+
+
+async def main(args: argparse.Namespace) -> None:
+    _, token = seed_user(transactions_per_month=0)
+    app = build_app()
+
+    async with client_for(app, token) as client:
+        categories = (await client.get("/api/v1/categories")).json()["categories"]
+        rows = [
+            {
+                "type": "expense",
+                "name": f"Imported {i}",
+                "categoryId": categories[i % len(categories)]["id"],
+                "amount": 1 + i % 100,
+                "date": f"2024-{1 + i % 12:02d}-{1 + i % 28:02d}",
+            }
+            for i in range(args.rows)
+        ]
+
+        single_rows = rows[:args.single_rows]
+        started = time.perf_counter()
+        for row in single_rows:
+            response = await client.post("/api/v1/transactions", json=row)
+            response.raise_for_status()
+        single_rate = len(single_rows) / (time.perf_counter() - started)
+
+        started = time.perf_counter()
+        response = await client.post("/api/v1/transactions/bulk", json=rows)
+        response.raise_for_status()
+        bulk_rate = response.json()["created"] / (time.perf_counter() - started)
+
+    print(f"single POST  {single_rate:>10.1f} rows/s  ({len(single_rows)} rows)")
+    print(f"bulk import  {bulk_rate:>10.1f} rows/s  ({len(rows)} rows)")
+    print(f"speedup      {bulk_rate / single_rate:>10.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--single-rows", type=int, default=500)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+    configure_database(args.database_url)
+    asyncio.run(main(args))
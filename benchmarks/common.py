@@ -0,0 +1,190 @@
+"""
+Shared helpers for benchmarks: database seeding, in-process client and reporting
+
+Benchmarks configure DATABASE_URL before the app is imported, so app modules
+are imported lazily inside the helpers below.
+"""
+import os
+import random
+import statistics
+import time
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+DEFAULT_DATABASE_URL = "sqlite:///./bench.db"
+BENCH_PASSWORD = "benchmark"
+
+
+def configure_database(database_url: Optional[str] = None) -> str:
+    """Point the app at a throwaway benchmark database"""
+    database_url = database_url or os.environ.get("BENCH_DATABASE_URL", DEFAULT_DATABASE_URL)
+    if database_url.startswith("sqlite:///"):
+        path = database_url[len("sqlite:///"):]
+        if os.path.exists(path):
+            os.remove(path)
+    os.environ["DATABASE_URL"] = database_url
+    return database_url
+
+
+def bench_email(user_id: uuid.UUID) -> str:
+    """Login email of a seeded user"""
+    return f"bench-{user_id.hex[:8]}@example.com"
+
+
+def seed_user(
+    categories: int = 8,
+    transactions_per_month: int = 100,
+    months: int = 1,
+    start: date = date(2024, 1, 1),
+    seed: int = 42
+) -> Tuple[uuid.UUID, str]:
+    """
+    Create tables, one user with synthetic categories and transactions.
+
+    Returns the user id and a bearer token for it.
+    """
+    from sqlalchemy import insert
+
+    from app.core.database import SessionLocal, engine
+    from app.core.security import create_access_token, get_password_hash
+    from app.models.models import Base, Category, MonthlyCategoryTotal, Transaction, User
+    from app.utils.money import parse_amount
+
+    rng = random.Random(seed)
+    Base.metadata.create_all(bind=engine)
+
+    user_id = uuid.uuid4()
+    with SessionLocal() as db:
+        db.add(User(
+            id=user_id,
+            full_name="Bench User",
+            email=bench_email(user_id),
+            hashed_password=get_password_hash(BENCH_PASSWORD)
+        ))
+        category_ids = [uuid.uuid4() for _ in range(categories)]
+        db.execute(insert(Category), [
+            {"id": cid, "user_id": user_id, "name": f"Category {i}", "icon": "ic", "color": "#000000"}
+            for i, cid in enumerate(category_ids)
+        ])
+
+        rows: List[Dict] = []
+        totals: Dict[tuple, List] = {}
+        for month in range(months):
+            month_start = date(start.year + (start.month - 1 + month) // 12, (start.month - 1 + month) % 12 + 1, 1)
+            for i in range(transactions_per_month):
+                day = month_start + timedelta(days=rng.randrange(28))
+                rows.append({
+                    "user_id": user_id,
+                    "category_id": rng.choice(category_ids),
+                    "type": "income" if rng.random() < 0.2 else "expense",
+                    "name": f"Transaction {i}",
+                    "amount": parse_amount(round(rng.uniform(1, 500), 2)),
+                    "date": day,
+                    "note": None,
+                })
+                bucket = totals.setdefault(
+                    (day.year, day.month, rows[-1]["type"], rows[-1]["category_id"]), [Decimal(0), 0]
+                )
+                bucket[0] += rows[-1]["amount"]
+                bucket[1] += 1
+                if len(rows) >= 5000:
+                    db.execute(insert(Transaction), rows)
+                    rows = []
+        if rows:
+            db.execute(insert(Transaction), rows)
+
+        # Keep the monthly rollup in step, as the API would
+        if totals:
+            db.execute(insert(MonthlyCategoryTotal), [
+                {"user_id": user_id, "year": year, "month": month, "type": kind,
+                 "category_id": category_id, "total": total, "count": count}
+                for (year, month, kind, category_id), (total, count) in totals.items()
+            ])
+        db.commit()
+
+    return user_id, create_access_token(data={"sub": str(user_id)})
+
+
+def build_app():
+    """API app without the static uploads mount, which needs /app/uploads"""
+    from fastapi import FastAPI
+
+    from app.api.v1.api import api_router
+    from app.core.config import settings
+
+    app = FastAPI()
+    app.include_router(api_router, prefix=settings.API_V1_STR)
+    return app
+
+
+def client_for(app, token: Optional[str] = None):
+    """In-process ASGI client"""
+    import httpx
+
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://bench", headers=headers
+    )
+
+
+async def run_load(client, method: str, url: str, concurrency: int, total: int, **kwargs) -> Dict:
+    """Issue `total` requests with `concurrency` workers and collect latencies"""
+    return await run_calls(lambda _: client.request(method, url, **kwargs), concurrency, total)
+
+
+async def run_calls(call: Callable[[int], Awaitable], concurrency: int, total: int) -> Dict:
+    """
+    Await call(0) ... call(total - 1) with `concurrency` workers, where each
+    call returns a response, and collect latencies
+    """
+    import asyncio
+
+    latencies: List[float] = []
+    errors = 0
+    remaining = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for index in remaining:
+            started = time.perf_counter()
+            response = await call(index)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return summarize(latencies, elapsed, errors)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(latencies: List[float], elapsed: float, errors: int = 0) -> Dict:
+    """Throughput and latency percentiles (milliseconds)"""
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+def print_row(name: str, result: Dict) -> None:
+    """Print one result line"""
+    print(
+        f"{name:<40} {result['rps']:>9} req/s  p50 {result['p50_ms']:>8} ms  "
+        f"p95 {result['p95_ms']:>8} ms  p99 {result['p99_ms']:>8} ms  errors {result['errors']}"
+    )
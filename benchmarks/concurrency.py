@@ -0,0 +1,47 @@
+"""
+Concurrent-request throughput of the async database layer
+
+Drives GET /summary and GET /categories through an in-process ASGI client at
+increasing concurrency. With the async session the event loop keeps serving
+other requests while a query is in flight, so throughput should scale with
+concurrency instead of flat-lining at the single-request rate. Run the same
+script against an older checkout to compare.
+
+Usage:
+    python -m benchmarks.concurrency [--transactions 5000] [--requests 400]
+    BENCH_DATABASE_URL=postgresql://... python -m benchmarks.concurrency
+"""
+import argparse
+import asyncio
+
+from benchmarks.common import (
+    build_app, client_for, configure_database, print_row, run_load, seed_user
+)
+
+
+async def main(args: argparse.Namespace) -> None:
+    _, token = seed_user(transactions_per_month=args.transactions)
+    app = build_app()
+
+    async with client_for(app, token) as client:
+        # Warm up connections and caches
+        await client.get("/api/v1/categories")
+
+        for concurrency in args.concurrency:
+            for name, url in (
+                ("summary", "/api/v1/summary?month=1&year=2024"),
+                ("categories", "/api/v1/categories"),
+            ):
+                result = await run_load(client, "GET", url, concurrency, args.requests)
+                print_row(f"{name} (concurrency={concurrency})", result)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--transactions", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+    configure_database(args.database_url)
+    asyncio.run(main(args))
@@ -0,0 +1,56 @@
+"""
+Transaction export: memory stays flat as the history grows
+
+Streams the full export of users with growing histories through each
+encoder and reports throughput, bytes produced and peak Python memory
+(tracemalloc). Peak memory should depend on the chunk size, not on the
+number of rows.
+
+Usage:
+    python -m benchmarks.export [--months 12 60 120] [--per-month 1000]
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from benchmarks.common import configure_database, seed_user
+
+
+async def export(user_id, format: str) -> dict:
+    from app.core.database import AsyncSessionLocal
+    from app.services.services import TransactionService
+    from app.utils.export import EXPORT_ENCODERS
+
+    size = 0
+    tracemalloc.start()
+    started = time.perf_counter()
+    async with AsyncSessionLocal() as db:
+        async for chunk in EXPORT_ENCODERS[format](TransactionService.stream_export_rows(db, user_id)):
+            size += len(chunk)
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"seconds": round(elapsed, 2), "mib": round(size / 2**20, 1), "peak_kib": peak // 1024}
+
+
+async def main(args: argparse.Namespace) -> None:
+    from app.utils.export import PARQUET_AVAILABLE
+
+    formats = ["csv", "ndjson"] + (["parquet"] if PARQUET_AVAILABLE else [])
+    for months in args.months:
+        user_id, _ = seed_user(transactions_per_month=args.per_month, months=months)
+        for format in formats:
+            result = await export(user_id, format)
+            print(f"{months * args.per_month:>8} rows  {format:<8} {result['seconds']:>7} s "
+                  f"{result['mib']:>8} MiB out  peak {result['peak_kib']:>8} KiB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--months", type=int, nargs="+", default=[12, 60, 120])
+    parser.add_argument("--per-month", type=int, default=1000)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+    configure_database(args.database_url)
+    asyncio.run(main(args))
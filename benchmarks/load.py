@@ -0,0 +1,376 @@
+"""
+Load test of every v1 API route, compared against a stored baseline
+
+Seeds synthetic users (categories x transactions per month x years), then
+drives each route of app/api/v1/api.py at a fixed concurrency and reports
+throughput and p50/p95/p99 latency per route. Results are compared with a
+baseline file; routes whose p95 grew or whose throughput dropped by more
+than --tolerance are flagged as regressions (exit status 1 with --strict).
+
+By default requests go through an in-process ASGI client against a fresh
+SQLite (or BENCH_DATABASE_URL) database. To load a real server instead,
+seed its database first and point the generator at it:
+
+    python -m benchmarks.load --seed-only --database-url postgresql://.../blui_bench
+    DATABASE_URL=postgresql://.../blui_bench WEB_CONCURRENCY=4 uvicorn app.main:app &
+    python -m benchmarks.load --base-url http://localhost:8000
+
+Baselines are machine specific: record one with --save-baseline on the
+machine (and database) the comparison will run on.
+
+Usage:
+    python -m benchmarks.load [--users 2] [--categories 8] [--transactions 50] [--years 1]
+                              [--requests 200] [--concurrency 8] [--routes summary ...]
+                              [--baseline PATH] [--save-baseline] [--tolerance 0.3] [--strict]
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import sys
+import tempfile
+import uuid
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from benchmarks.common import (
+    BENCH_PASSWORD, bench_email, build_app, configure_database, print_row, run_calls, seed_user
+)
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "load.json")
+DEFAULT_MANIFEST = "bench_load_users.json"
+API = "/api/v1"
+
+
+@dataclass
+class BenchUser:
+    """A seeded user as seen through the API"""
+
+    email: str
+    headers: Dict[str, str] = field(default_factory=dict)
+    category_ids: List[str] = field(default_factory=list)
+    transaction_ids: List[str] = field(default_factory=list)
+
+
+@dataclass
+class Scenario:
+    """
+    Load for one route. prepare() runs untimed before the load and returns
+    one item per request (ids to update or delete); request() sends
+    request number i. max_requests caps routes that are slow by design,
+    such as password hashing.
+    """
+
+    name: str
+    method: str
+    path: str
+    request: Callable[..., Awaitable]
+    prepare: Optional[Callable[..., Awaitable[list]]] = None
+    max_requests: Optional[int] = None
+
+
+def _transaction_body(user: BenchUser, i: int) -> dict:
+    return {
+        "type": "expense",
+        "name": f"Load {i}",
+        "categoryId": user.category_ids[i % len(user.category_ids)],
+        "amount": 12.5 + i % 100,
+        "date": f"2024-01-{1 + i % 28:02d}",
+    }
+
+
+def _png() -> bytes:
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.new("RGB", (320, 240), (40, 120, 200)).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+async def _create_transactions(client, users: List[BenchUser], total: int) -> list:
+    items = []
+    for i in range(total):
+        user = users[i % len(users)]
+        response = await client.post(f"{API}/transactions", json=_transaction_body(user, i), headers=user.headers)
+        items.append(response.json()["id"])
+    return items
+
+
+async def _create_categories(client, users: List[BenchUser], total: int) -> list:
+    items = []
+    for i in range(total):
+        user = users[i % len(users)]
+        response = await client.post(
+            f"{API}/categories", json={"name": f"Load {i}", "icon": "ic", "color": "#123456"}, headers=user.headers
+        )
+        items.append(response.json()["id"])
+    return items
+
+
+def build_scenarios() -> List[Scenario]:
+    """One scenario per route, reads first so that writes do not skew them"""
+    photo = _png()
+
+    def get(path: str, params: Optional[dict] = None):
+        async def request(client, user, i, item):
+            return await client.get(path, params=params, headers=user.headers)
+        return request
+
+    def user_item(path: str, method: str, body: Optional[Callable] = None):
+        async def request(client, user, i, item):
+            # Items were created round-robin over the users, as requests are
+            json_body = body(user, i) if body else None
+            return await client.request(method, path.format(id=item), json=json_body, headers=user.headers)
+        return request
+
+    async def register(client, user, i, item):
+        return await client.post(f"{API}/auth/register", json={
+            "fullName": "Load User", "email": f"load-{uuid.uuid4().hex[:12]}@example.com", "password": BENCH_PASSWORD
+        })
+
+    async def login(client, user, i, item):
+        return await client.post(f"{API}/auth/login", json={"email": user.email, "password": BENCH_PASSWORD})
+
+    async def get_transaction(client, user, i, item):
+        transaction_id = user.transaction_ids[i % len(user.transaction_ids)]
+        return await client.get(f"{API}/transactions/{transaction_id}", headers=user.headers)
+
+    async def create_transaction(client, user, i, item):
+        return await client.post(f"{API}/transactions", json=_transaction_body(user, i), headers=user.headers)
+
+    async def create_category(client, user, i, item):
+        return await client.post(
+            f"{API}/categories", json={"name": f"New {i}", "icon": "ic", "color": "#654321"}, headers=user.headers
+        )
+
+    async def bulk(client, user, i, item):
+        rows = [_transaction_body(user, i * 10 + row) for row in range(10)]
+        return await client.post(f"{API}/transactions/bulk", json=rows, headers=user.headers)
+
+    async def batch(client, user, i, item):
+        operations = [
+            {"op": "create", "entity": "transaction", "data": _transaction_body(user, i * 5 + row)}
+            for row in range(5)
+        ]
+        return await client.post(f"{API}/batch", json={"operations": operations}, headers=user.headers)
+
+    async def upload_photo(client, user, i, item):
+        return await client.post(
+            f"{API}/user/photo", files={"photo": ("photo.png", photo, "image/png")}, headers=user.headers
+        )
+
+    async def update_profile(client, user, i, item):
+        return await client.put(f"{API}/user/profile", json={"fullName": f"Load User {i}"}, headers=user.headers)
+
+    return [
+        Scenario("auth.login", "POST", "/auth/login", login, max_requests=40),
+        Scenario("user.profile", "GET", "/user/profile", get(f"{API}/user/profile")),
+        Scenario("categories.list", "GET", "/categories", get(f"{API}/categories")),
+        Scenario("transactions.list", "GET", "/transactions", get(f"{API}/transactions")),
+        Scenario("transactions.page", "GET", "/transactions",
+                 get(f"{API}/transactions", {"limit": 50})),
+        Scenario("transactions.month", "GET", "/transactions",
+                 get(f"{API}/transactions", {"month": 1, "year": 2024})),
+        Scenario("transactions.stream", "GET", "/transactions/stream", get(f"{API}/transactions/stream")),
+        Scenario("transactions.export", "GET", "/transactions/export",
+                 get(f"{API}/transactions/export", {"format": "csv"})),
+        Scenario("transactions.search", "GET", "/transactions/search",
+                 get(f"{API}/transactions/search", {"q": "transaction 1", "limit": 20})),
+        Scenario("transactions.grouped", "GET", "/transactions/grouped",
+                 get(f"{API}/transactions/grouped", {"month": 1, "year": 2024})),
+        Scenario("transactions.grouped.page", "GET", "/transactions/grouped",
+                 get(f"{API}/transactions/grouped", {"days": 30})),
+        Scenario("transactions.get", "GET", "/transactions/{transaction_id}", get_transaction),
+        Scenario("summary", "GET", "/summary", get(f"{API}/summary", {"month": 1, "year": 2024})),
+        Scenario("summary.history", "GET", "/summary/history", get(f"{API}/summary/history", {
+            "start_month": 1, "start_year": 2024, "end_month": 12, "end_year": 2024
+        })),
+        Scenario("sync.full", "GET", "/sync", get(f"{API}/sync")),
+        Scenario("auth.register", "POST", "/auth/register", register, max_requests=40),
+        Scenario("user.update", "PUT", "/user/profile", update_profile),
+        Scenario("user.photo", "POST", "/user/photo", upload_photo),
+        Scenario("categories.create", "POST", "/categories", create_category),
+        Scenario("transactions.create", "POST", "/transactions", create_transaction),
+        Scenario("transactions.bulk", "POST", "/transactions/bulk", bulk),
+        Scenario("batch", "POST", "/batch", batch),
+        Scenario("transactions.update", "PUT", "/transactions/{transaction_id}",
+                 user_item(f"{API}/transactions/{{id}}", "PUT", lambda user, i: {"amount": 99.5}),
+                 _create_transactions),
+        Scenario("transactions.delete", "DELETE", "/transactions/{transaction_id}",
+                 user_item(f"{API}/transactions/{{id}}", "DELETE"), _create_transactions),
+        Scenario("categories.delete", "DELETE", "/categories/{category_id}",
+                 user_item(f"{API}/categories/{{id}}", "DELETE"), _create_categories),
+    ]
+
+
+def uncovered_routes(scenarios: List[Scenario]) -> List[str]:
+    """Routes of the v1 router that no scenario drives"""
+    from fastapi.routing import APIRoute
+
+    from app.api.v1.api import api_router
+
+    covered = {(scenario.method, scenario.path) for scenario in scenarios}
+    return sorted(
+        f"{method} {route.path}"
+        for route in api_router.routes if isinstance(route, APIRoute)
+        for method in route.methods
+        if (method, route.path) not in covered
+    )
+
+
+def seed(args: argparse.Namespace) -> List[str]:
+    """Seed the benchmark users and return their emails"""
+    emails = []
+    for index in range(args.users):
+        user_id, _ = seed_user(
+            categories=args.categories,
+            transactions_per_month=args.transactions,
+            months=12 * args.years,
+            seed=index
+        )
+        emails.append(bench_email(user_id))
+    return emails
+
+
+async def load_users(client, emails: List[str]) -> List[BenchUser]:
+    """Log the seeded users in and fetch the ids the scenarios need"""
+    users = []
+    for email in emails:
+        response = await client.post(f"{API}/auth/login", json={"email": email, "password": BENCH_PASSWORD})
+        response.raise_for_status()
+        user = BenchUser(email=email, headers={"Authorization": f"Bearer {response.json()['token']}"})
+        categories = await client.get(f"{API}/categories", headers=user.headers)
+        user.category_ids = [category["id"] for category in categories.json()["categories"]]
+        transactions = await client.get(f"{API}/transactions", params={"limit": 100}, headers=user.headers)
+        user.transaction_ids = [transaction["id"] for transaction in transactions.json()["transactions"]]
+        users.append(user)
+    return users
+
+
+async def run_scenario(client, scenario: Scenario, users: List[BenchUser], args: argparse.Namespace) -> Dict:
+    total = min(args.requests, scenario.max_requests or args.requests)
+    items = await scenario.prepare(client, users, total) if scenario.prepare else [None] * total
+
+    def call(i: int):
+        return scenario.request(client, users[i % len(users)], i, items[i])
+
+    return await run_calls(call, args.concurrency, total)
+
+
+def compare(results: Dict[str, Dict], baseline: Dict, tolerance: float) -> List[str]:
+    """Print each route against the baseline and return the regressed ones"""
+    regressions = []
+    print(f"\n{'route':<24} {'req/s':>18} {'p95 ms':>20}")
+    for name, result in results.items():
+        base = baseline["results"].get(name)
+        if base is None:
+            print(f"{name:<24} {'(not in baseline)':>18}")
+            continue
+        rps_change = result["rps"] / base["rps"] - 1 if base["rps"] else 0.0
+        p95_change = result["p95_ms"] / base["p95_ms"] - 1 if base["p95_ms"] else 0.0
+        regressed = rps_change < -tolerance or p95_change > tolerance
+        if regressed:
+            regressions.append(name)
+        print(
+            f"{name:<24} {base['rps']:>8} -> {result['rps']:<8} "
+            f"{base['p95_ms']:>8} -> {result['p95_ms']:<9} {'REGRESSION' if regressed else ''}"
+        )
+    return regressions
+
+
+def scale_of(args: argparse.Namespace) -> Dict:
+    return {
+        "users": args.users,
+        "categories": args.categories,
+        "transactions_per_month": args.transactions,
+        "years": args.years,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "target": "external" if args.base_url else "in-process",
+    }
+
+
+async def main(args: argparse.Namespace) -> int:
+    import httpx
+
+    if args.base_url:
+        with open(args.manifest) as f:
+            emails = json.load(f)["users"]
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=60)
+    else:
+        emails = seed(args)
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=build_app()), base_url="http://bench", timeout=60)
+
+    scenarios = build_scenarios()
+    missing = uncovered_routes(scenarios)
+    if missing:
+        print(f"Routes without a scenario: {', '.join(missing)}", file=sys.stderr)
+    if args.routes:
+        scenarios = [scenario for scenario in scenarios if scenario.name in args.routes]
+
+    results: Dict[str, Dict] = {}
+    async with client:
+        users = await load_users(client, emails)
+        for scenario in scenarios:
+            results[scenario.name] = result = await run_scenario(client, scenario, users, args)
+            print_row(scenario.name, result)
+
+    run = {"scale": scale_of(args), "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(run, f, indent=2)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(run, f, indent=2)
+            f.write("\n")
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; record one with --save-baseline")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline["scale"] != run["scale"]:
+        print(f"\nWarning: baseline was recorded at a different scale: {baseline['scale']}")
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} route(s) regressed by more than {args.tolerance:.0%}: {', '.join(regressions)}")
+        return 1 if args.strict else 0
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=2)
+    parser.add_argument("--categories", type=int, default=8)
+    parser.add_argument("--transactions", type=int, default=50, help="transactions per month per user")
+    parser.add_argument("--years", type=int, default=1)
+    parser.add_argument("--requests", type=int, default=200, help="requests per route")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--routes", nargs="+", help="only run these scenarios")
+    parser.add_argument("--base-url", default=None, help="load a running server instead of the in-process app")
+    parser.add_argument("--seed-only", action="store_true", help="seed the database and write the manifest")
+    parser.add_argument("--manifest", default=DEFAULT_MANIFEST, help="emails of the seeded users")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.3)
+    parser.add_argument("--strict", action="store_true", help="exit with status 1 on regressions")
+    parser.add_argument("--output", default=None, help="also write this run's results as JSON")
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    if args.seed_only:
+        configure_database(args.database_url)
+        with open(args.manifest, "w") as f:
+            json.dump({"users": seed(args)}, f)
+        print(f"Seeded {args.users} users into {os.environ['DATABASE_URL']}, manifest {args.manifest}")
+        sys.exit(0)
+    if not args.base_url:
+        configure_database(args.database_url)
+        # Photo uploads of the in-process app go to a scratch directory
+        os.environ.setdefault("UPLOAD_DIR", tempfile.mkdtemp(prefix="bench-uploads-"))
+    sys.exit(asyncio.run(main(args)))
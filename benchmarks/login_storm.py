@@ -0,0 +1,62 @@
+"""
+Latency of regular endpoints during a login storm
+
+Measures GET /categories on its own, then again while many clients hammer
+POST /auth/login. With bcrypt running in the bounded hashing pool, the
+event loop keeps serving /categories, and logins beyond the pool's queue
+limit are rejected with 503 instead of piling up.
+
+Usage:
+    python -m benchmarks.login_storm [--logins 200] [--login-concurrency 64]
+"""
+import argparse
+import asyncio
+from collections import Counter
+
+from benchmarks.common import (
+    BENCH_PASSWORD, bench_email, build_app, client_for, configure_database,
+    print_row, run_load, seed_user
+)
+
+
+async def main(args: argparse.Namespace) -> None:
+    user_id, token = seed_user(transactions_per_month=10)
+    app = build_app()
+    login = {"email": bench_email(user_id), "password": BENCH_PASSWORD}
+
+    async with client_for(app, token) as client:
+        await client.get("/api/v1/categories")
+
+        quiet = await run_load(client, "GET", "/api/v1/categories", args.concurrency, args.requests)
+        print_row("categories (idle)", quiet)
+
+        statuses = Counter()
+
+        async def storm():
+            remaining = iter(range(args.logins))
+
+            async def worker():
+                for _ in remaining:
+                    response = await client.post("/api/v1/auth/login", json=login)
+                    statuses[response.status_code] += 1
+
+            await asyncio.gather(*(worker() for _ in range(args.login_concurrency)))
+
+        storm_task = asyncio.create_task(storm())
+        await asyncio.sleep(0.05)
+        busy = await run_load(client, "GET", "/api/v1/categories", args.concurrency, args.requests)
+        await storm_task
+        print_row("categories (during login storm)", busy)
+        print(f"login responses: {dict(statuses)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--login-concurrency", type=int, default=64)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+    configure_database(args.database_url)
+    asyncio.run(main(args))
@@ -0,0 +1,78 @@
+"""
+Overhead of request and service metrics on GET /categories
+
+Runs the same load against the app with and without the metrics
+middleware and service timing, alternating rounds so that drift in the
+machine affects both equally, and reports the median throughput of each.
+The instrumented app should stay within 2% of the bare one.
+
+Usage:
+    python -m benchmarks.metrics_overhead [--rounds 5] [--requests 1000]
+"""
+import argparse
+import asyncio
+import statistics
+from contextlib import contextmanager
+
+from benchmarks.common import build_app, client_for, configure_database, seed_user
+
+
+@contextmanager
+def services_unwrapped():
+    """Temporarily restore the undecorated service methods"""
+    from app.services import services
+
+    originals = []
+    for cls in (services.AuthService, services.CategoryService, services.TransactionService,
+                services.MonthlyTotalsService, services.SummaryService):
+        for attribute, value in list(vars(cls).items()):
+            if isinstance(value, staticmethod) and hasattr(value.__func__, "__wrapped__"):
+                originals.append((cls, attribute, value))
+                setattr(cls, attribute, staticmethod(value.__func__.__wrapped__))
+    try:
+        yield
+    finally:
+        for cls, attribute, value in originals:
+            setattr(cls, attribute, value)
+
+
+async def throughput(app, token, args) -> float:
+    from benchmarks.common import run_load
+
+    async with client_for(app, token) as client:
+        await client.get("/api/v1/categories")
+        result = await run_load(client, "GET", "/api/v1/categories", args.concurrency, args.requests)
+    return result["rps"]
+
+
+async def main(args: argparse.Namespace) -> None:
+    from app.core.metrics import MetricsMiddleware
+
+    _, token = seed_user(transactions_per_month=10)
+    bare_app = build_app()
+    instrumented_app = build_app()
+    instrumented_app.add_middleware(MetricsMiddleware)
+
+    bare, instrumented = [], []
+    for _ in range(args.rounds):
+        with services_unwrapped():
+            bare.append(await throughput(bare_app, token, args))
+        instrumented.append(await throughput(instrumented_app, token, args))
+
+    bare_rps = statistics.median(bare)
+    instrumented_rps = statistics.median(instrumented)
+    overhead = (bare_rps - instrumented_rps) / bare_rps * 100
+    print(f"bare          {bare_rps:>9} req/s")
+    print(f"instrumented  {instrumented_rps:>9} req/s")
+    print(f"overhead      {overhead:>8.2f} %")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+    configure_database(args.database_url)
+    asyncio.run(main(args))
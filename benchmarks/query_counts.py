@@ -0,0 +1,63 @@
+"""
+SQL statements issued per request, at different result sizes
+
+Counts the statements each transaction read path sends to the database
+for a small and a large month. The counts must not depend on the number
+of rows returned; the script exits with status 1 if any of them does,
+which would mean a lazy load (N+1) has crept back in.
+
+Usage:
+    python -m benchmarks.query_counts [--sizes 10 1000]
+"""
+import argparse
+import asyncio
+import sys
+
+from sqlalchemy import event
+
+from benchmarks.common import build_app, client_for, configure_database, seed_user
+
+READ_PATHS = [
+    "/api/v1/transactions?month=1&year=2024",
+    "/api/v1/transactions?month=1&year=2024&limit=500",
+    "/api/v1/transactions/grouped?month=1&year=2024",
+    "/api/v1/transactions/stream?month=1&year=2024",
+    "/api/v1/summary?month=1&year=2024",
+]
+
+
+async def main(args: argparse.Namespace) -> int:
+    from app.core.database import async_engine
+
+    statements = []
+    event.listen(
+        async_engine.sync_engine, "before_cursor_execute",
+        lambda conn, cursor, statement, *rest: statements.append(statement)
+    )
+
+    app = build_app()
+    counts = {}
+    for size in args.sizes:
+        _, token = seed_user(transactions_per_month=size)
+        async with client_for(app, token) as client:
+            for path in READ_PATHS:
+                statements.clear()
+                response = await client.get(path)
+                response.raise_for_status()
+                counts.setdefault(path, []).append(len(statements))
+
+    failed = False
+    for path, path_counts in counts.items():
+        constant = len(set(path_counts)) == 1
+        failed = failed or not constant
+        print(f"{path:<55} {path_counts} {'ok' if constant else 'GROWS WITH ROWS'}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000])
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+    configure_database(args.database_url)
+    sys.exit(asyncio.run(main(args)))
@@ -0,0 +1,94 @@
+"""
+Query-plan regression check for per-user transaction reads
+
+Runs EXPLAIN on the month, date-range, combined-filter, oldest-first and
+keyset-page queries and the per-date totals of /transactions/grouped built
+by TransactionService, and checks that each one is a range scan on
+ix_transactions_user_id_date with no separate sort step, and that the
+delta sync query scans ix_transactions_user_id_updated_at. Exits with
+status 1 if any plan regresses, e.g. back to a LIKE scan or a full table
+scan.
+
+Works on SQLite (EXPLAIN QUERY PLAN) and PostgreSQL (EXPLAIN, with
+sequential scans disabled so small test tables still show the index path).
+
+Usage:
+    python -m benchmarks.query_plans [--database-url URL]
+"""
+import argparse
+import sys
+import uuid
+from datetime import date, datetime
+
+from sqlalchemy import tuple_
+
+from benchmarks.common import configure_database, seed_user
+
+LIST_INDEX = "ix_transactions_user_id_date"
+SYNC_INDEX = "ix_transactions_user_id_updated_at"
+
+
+def explain(connection, statement) -> str:
+    """Plan of a statement as a single string"""
+    sql = str(statement.compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True}))
+    if connection.dialect.name == "postgresql":
+        connection.exec_driver_sql("SET enable_seqscan = off")
+        rows = connection.exec_driver_sql(f"EXPLAIN {sql}").fetchall()
+        return "\n".join(row[0] for row in rows)
+    rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+    return "\n".join(row[-1] for row in rows)
+
+
+def main(args: argparse.Namespace) -> int:
+    from app.core.database import engine
+    from app.models.models import Transaction
+    from app.schemas.schemas import TransactionFilter
+    from app.services.services import TransactionService
+
+    user_id, _ = seed_user(transactions_per_month=200, months=3)
+    user_id = uuid.UUID(str(user_id))
+
+    # name -> (query, index it must use)
+    queries = {
+        "month": (TransactionService._filtered_query(user_id, TransactionFilter(month=2, year=2024)), LIST_INDEX),
+        "date range": (TransactionService._filtered_query(
+            user_id, TransactionFilter(start_date=date(2024, 1, 15), end_date=date(2024, 2, 15))
+        ), LIST_INDEX),
+        "combined": (TransactionService._filtered_query(user_id, TransactionFilter(
+            type="expense", category_ids=[uuid.UUID(int=1)], min_amount=10, max_amount=100,
+            start_date=date(2024, 1, 1), text="coffee"
+        )), LIST_INDEX),
+        "oldest first": (TransactionService._filtered_query(
+            user_id, TransactionFilter(month=2, year=2024, sort="date_asc")
+        ), LIST_INDEX),
+        "keyset page": (TransactionService._filtered_query(user_id).where(
+            tuple_(Transaction.date, Transaction.created_at, Transaction.id)
+            < tuple_(date(2024, 2, 1), datetime(2024, 2, 1), uuid.UUID(int=0))
+        ).limit(50), LIST_INDEX),
+        "date totals": (TransactionService._date_totals_query(TransactionService._filter_criteria(
+            user_id, TransactionFilter(start_date=date(2024, 1, 15))
+        )).where(Transaction.date < date(2024, 3, 1)).limit(31), LIST_INDEX),
+        "sync": (TransactionService._plain_query(user_id).order_by(None).where(
+            Transaction.updated_at > datetime.utcnow()
+        ), SYNC_INDEX),
+    }
+
+    failed = False
+    with engine.connect() as connection:
+        for name, (query, index_name) in queries.items():
+            plan = explain(connection, query)
+            uses_index = index_name in plan
+            sorts = "TEMP B-TREE" in plan or "Sort" in plan
+            ok = uses_index and not sorts
+            failed = failed or not ok
+            print(f"{name:<12} {'ok' if ok else 'REGRESSED'}")
+            print("    " + plan.replace("\n", "\n    "))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+    configure_database(args.database_url)
+    sys.exit(main(args))
@@ -0,0 +1,86 @@
+"""
+GET /transactions serialization: Pydantic models vs plain rows
+
+For a 10k-row (by default) transaction list, compares the model path
+(ORM objects with their categories, one Transaction model per row,
+rendered the way FastAPI renders response_model) against the plain-row
+path used by the endpoint (column tuples encoded straight to JSON).
+Reports CPU time and peak Python memory (tracemalloc) for loading plus
+serializing, and checks that both produce identical bytes.
+
+Usage:
+    python -m benchmarks.serialization [--rows 10000] [--repeat 5]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import tracemalloc
+
+from benchmarks.common import configure_database, seed_user
+
+
+async def model_path(db, user_id) -> bytes:
+    from fastapi.responses import JSONResponse
+
+    from app.schemas.schemas import TransactionsListResponse
+    from app.services.services import TransactionService
+
+    transactions = await TransactionService.get_user_transactions(db, user_id)
+    response = TransactionsListResponse(transactions=transactions)
+    return JSONResponse(response.model_dump(mode="json", by_alias=True)).body
+
+
+async def plain_path(db, user_id) -> bytes:
+    from app.services.services import TransactionService
+    from app.utils.fast_json import render_transactions_list
+
+    rows = await TransactionService.get_user_transactions(db, user_id, plain=True)
+    return render_transactions_list(rows)
+
+
+async def measure(func, user_id, repeat: int) -> dict:
+    """
+    Median CPU time of a serialization path, then its peak traced memory in
+    a separate run (tracing slows everything down)
+    """
+    from app.core.database import AsyncSessionLocal
+
+    cpu_times = []
+    for _ in range(repeat):
+        async with AsyncSessionLocal() as db:
+            started = time.process_time()
+            body = await func(db, user_id)
+            cpu_times.append(time.process_time() - started)
+
+    async with AsyncSessionLocal() as db:
+        tracemalloc.start()
+        await func(db, user_id)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return {"cpu_ms": round(statistics.median(cpu_times) * 1000, 1), "peak_kib": peak // 1024, "body": body}
+
+
+async def main(args: argparse.Namespace) -> None:
+    months = 10
+    user_id, _ = seed_user(transactions_per_month=args.rows // months, months=months)
+
+    model = await measure(model_path, user_id, args.repeat)
+    plain = await measure(plain_path, user_id, args.repeat)
+
+    for name, result in (("pydantic models", model), ("plain rows", plain)):
+        print(f"{name:<16} cpu {result['cpu_ms']:>8} ms  peak {result['peak_kib']:>8} KiB  "
+              f"body {len(result['body']) // 1024} KiB")
+    print(f"identical output: {model['body'] == plain['body']}")
+    if model["body"] != plain["body"]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+    configure_database(args.database_url)
+    asyncio.run(main(args))
@@ -0,0 +1,87 @@
+"""
+Monthly summary: aggregated reads vs loading every transaction
+
+Compares SummaryService.get_monthly_summary, which reads the monthly
+rollup, against the original implementation, which loaded the month's transactions as ORM objects and
+summed them in Python, at several transactions-per-month sizes. Reports
+latency and peak Python memory (tracemalloc) for each.
+
+Usage:
+    python -m benchmarks.summary [--sizes 1000 10000 100000] [--repeat 5]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import tracemalloc
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+
+from benchmarks.common import configure_database, seed_user
+
+
+async def legacy_monthly_summary(db, user_id, month: int, year: int) -> dict:
+    """The pre-aggregation path: ORM rows + Python sums + lazy categories"""
+    from sqlalchemy import select
+    from sqlalchemy.orm import selectinload
+
+    from app.models.models import Transaction
+
+    result = await db.execute(
+        select(Transaction)
+        .options(selectinload(Transaction.category))
+        .where(
+            Transaction.user_id == user_id,
+            Transaction.date >= date(year, month, 1),
+            Transaction.date < (date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1))
+        )
+    )
+    transactions = result.scalars().all()
+    totals = defaultdict(Decimal)
+    by_category = defaultdict(Decimal)
+    for transaction in transactions:
+        totals[transaction.type] += transaction.amount
+        by_category[(transaction.type, transaction.category.name)] += transaction.amount
+    return {"totals": dict(totals), "categories": len(by_category)}
+
+
+async def measure(func, repeat: int) -> dict:
+    """Median latency and peak traced memory of an async callable"""
+    from app.core.database import AsyncSessionLocal
+
+    latencies = []
+    peak = 0
+    for _ in range(repeat):
+        async with AsyncSessionLocal() as db:
+            tracemalloc.start()
+            started = time.perf_counter()
+            await func(db)
+            latencies.append(time.perf_counter() - started)
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+    return {"median_ms": round(statistics.median(latencies) * 1000, 2), "peak_kib": peak // 1024}
+
+
+async def main(args: argparse.Namespace) -> None:
+    from app.services.services import SummaryService
+
+    for size in args.sizes:
+        # Each size gets its own user; every query is scoped by user_id
+        user_id, _ = seed_user(transactions_per_month=size)
+
+        legacy = await measure(lambda db: legacy_monthly_summary(db, user_id, 1, 2024), args.repeat)
+        current = await measure(lambda db: SummaryService.get_monthly_summary(db, user_id, 1, 2024), args.repeat)
+
+        print(f"{size:>7} tx/month  legacy {legacy['median_ms']:>9} ms {legacy['peak_kib']:>8} KiB  "
+              f"current {current['median_ms']:>9} ms {current['peak_kib']:>8} KiB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+    configure_database(args.database_url)
+    asyncio.run(main(args))
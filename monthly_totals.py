@@ -0,0 +1,43 @@
+"""
+Rebuild or verify the monthly_category_totals rollup
+
+    python monthly_totals.py rebuild [--user-id ID]
+    python monthly_totals.py verify [--user-id ID]
+
+verify exits with status 1 if the rollup has drifted from the transactions.
+"""
+import argparse
+import asyncio
+import sys
+
+from app.core.database import AsyncSessionLocal
+from app.services.services import MonthlyTotalsService
+
+
+async def rebuild(user_id=None) -> int:
+    """Backfill the rollup from the transactions table"""
+    async with AsyncSessionLocal() as db:
+        buckets = await MonthlyTotalsService.rebuild(db, user_id)
+    print(f"Rebuilt {buckets} monthly totals")
+    return 0
+
+
+async def verify(user_id=None) -> int:
+    """Report buckets whose totals no longer match the transactions"""
+    async with AsyncSessionLocal() as db:
+        drift = await MonthlyTotalsService.verify(db, user_id)
+
+    for bucket, expected, actual in drift:
+        print(f"Drift in {bucket}: expected {expected}, found {actual}")
+    print(f"{len(drift)} drifted monthly totals")
+    return 1 if drift else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild or verify monthly totals")
+    parser.add_argument("command", choices=["rebuild", "verify"])
+    parser.add_argument("--user-id", default=None)
+    args = parser.parse_args()
+
+    command = rebuild if args.command == "rebuild" else verify
+    sys.exit(asyncio.run(command(args.user_id)))
@@ -0,0 +1,22 @@
+"""
+Delete sync tombstones older than SYNC_TOMBSTONE_RETENTION_DAYS
+
+    python prune_tombstones.py
+
+Clients whose last sync is older than the retention get a full sync, so
+older tombstones are never read again.
+"""
+import asyncio
+
+from app.core.database import AsyncSessionLocal
+from app.services.services import SyncService
+
+
+async def prune() -> None:
+    async with AsyncSessionLocal() as db:
+        pruned = await SyncService.prune_tombstones(db)
+    print(f"Pruned {pruned} tombstones")
+
+
+if __name__ == "__main__":
+    asyncio.run(prune())